@@ -8,6 +8,11 @@ proofs and accumulator updates.
 from typing import Iterable, Optional, Tuple, Set
 from functools import reduce
 
+try:
+    import gmpy2
+except ImportError:  # Optional: fall back to Python's built-in pow
+    gmpy2 = None
+
 try:
     from .trapdoor_operations import trapdoor_remove_member, trapdoor_batch_remove_members
 except ImportError:
@@ -166,7 +171,9 @@ def verify_membership(w: int, p: int, A: int, N: int) -> bool:
     if w >= N or A >= N:
         return False
 
-    # Check if w^p ≡ A (mod N)
+    # Check if w^p ≡ A (mod N); GMP's powmod is much faster for 2048-bit N
+    if gmpy2 is not None:
+        return gmpy2.powmod(w, p, N) == A
     return pow(w, p, N) == A
 
 
@@ -7,6 +7,7 @@ in the RSA accumulator system for IoT device authentication and identity managem
 
 import json
 import base64
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from cryptography.hazmat.primitives import serialization
@@ -14,6 +15,23 @@ from cryptography.hazmat.primitives.asymmetric import rsa, ed25519
 from cryptography.hazmat.backends import default_backend
 
 
+# Encodings of the 8 small-order Ed25519 points. A signature whose R is one
+# of these is rejected before verification (RFC 8032 strict checks).
+_ED25519_SMALL_ORDER_R = frozenset(bytes.fromhex(h) for h in (
+    "0100000000000000000000000000000000000000000000000000000000000000",
+    "ecffffffffffffffffffffffffffffffffffffffffffffffffffffffffffff7f",
+    "0000000000000000000000000000000000000000000000000000000000000000",
+    "0000000000000000000000000000000000000000000000000000000000000080",
+    "c7176a703d4dd84fba3c0b760d10670f2a2053fa2c39ccc64ec7fd7792ac037a",
+    "c7176a703d4dd84fba3c0b760d10670f2a2053fa2c39ccc64ec7fd7792ac03fa",
+    "26e8958fc2b227b045c3f489f2ef98f0d5dfac05d3c63339b13802886d53fc05",
+    "26e8958fc2b227b045c3f489f2ef98f0d5dfac05d3c63339b13802886d53fc85",
+))
+
+# Order of the Ed25519 base point; S must be reduced modulo it
+_ED25519_L = 2**252 + 27742317777372353535851937790883648493
+
+
 def generate_rsa_keypair(key_size: int = 2048, public_exponent: int = 65537) -> Tuple[str, str]:
     """
     Generate an RSA keypair for IoT device authentication.
@@ -251,6 +269,29 @@ def generate_device_signature(message: str, private_key_data: str, key_type: str
         raise ValueError("key_type must be 'ed25519' or 'rsa'")
 
 
+@lru_cache(maxsize=1024)
+def load_public_key(public_key_pem: str):
+    """
+    Parse a PEM public key, caching the resulting key object.
+    
+    Devices present the same PEM on every authentication, so repeated
+    verifications skip the base64/ASN.1 parse after the first one.
+    
+    Args:
+        public_key_pem: Public key in PEM format
+        
+    Returns:
+        Ed25519PublicKey or RSAPublicKey
+        
+    Raises:
+        ValueError: If the PEM cannot be parsed
+    """
+    return serialization.load_pem_public_key(
+        public_key_pem.encode(),
+        backend=default_backend()
+    )
+
+
 def verify_device_signature(message: str, signature_base64: str, public_key_pem: str, key_type: str = "ed25519") -> bool:
     """
     Verify a signature using device public key.
@@ -271,16 +312,21 @@ def verify_device_signature(message: str, signature_base64: str, public_key_pem:
         >>> print(f"Signature valid: {is_valid}")
     """
     try:
-        # Load public key
-        public_key = serialization.load_pem_public_key(
-            public_key_pem.encode(),
-            backend=default_backend()
-        )
+        # Load public key (cached per PEM)
+        public_key = load_public_key(public_key_pem)
 
         # Decode signature
         signature = base64.b64decode(signature_base64)
 
         if key_type == "ed25519":
+            # Cheap malleability checks first: small-order R, non-canonical S
+            if (
+                len(signature) != 64
+                or signature[:32] in _ED25519_SMALL_ORDER_R
+                or int.from_bytes(signature[32:], 'little') >= _ED25519_L
+            ):
+                raise ValueError("Non-canonical or small-order Ed25519 signature")
+
             # Verify Ed25519 signature
             public_key.verify(signature, message.encode())
             return True
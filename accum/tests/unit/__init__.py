@@ -6,4 +6,5 @@ Tests individual modules in isolation:
 - test_hash_to_prime.py: Hash-to-prime conversion
 - test_accumulator.py: Core accumulator operations
 - test_witness_refresh.py: Witness update algorithms
+- test_rsa_key_generator.py: Device signature verification checks
 """
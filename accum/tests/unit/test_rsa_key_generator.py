@@ -0,0 +1,108 @@
+"""
+Unit Tests for Device Signature Verification
+
+Tests verify_device_signature's Ed25519 malleability checks (signature
+length, small-order R, non-canonical S) and that other key types bypass
+them.
+"""
+
+import base64
+import os
+import pytest
+
+try:
+    from accum.rsa_key_generator import (
+        generate_ed25519_keypair, generate_rsa_keypair,
+        generate_device_signature, verify_device_signature
+    )
+except ImportError:
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+    from rsa_key_generator import (
+        generate_ed25519_keypair, generate_rsa_keypair,
+        generate_device_signature, verify_device_signature
+    )
+
+
+MESSAGE = "nonce:deadbeef"
+
+# Order of the Ed25519 base point
+ED25519_L = 2**252 + 27742317777372353535851937790883648493
+
+# The 8 small-order point encodings (RFC 8032 / libsodium blocklist)
+SMALL_ORDER_R = [
+    "0100000000000000000000000000000000000000000000000000000000000000",
+    "ecffffffffffffffffffffffffffffffffffffffffffffffffffffffffffff7f",
+    "0000000000000000000000000000000000000000000000000000000000000000",
+    "0000000000000000000000000000000000000000000000000000000000000080",
+    "c7176a703d4dd84fba3c0b760d10670f2a2053fa2c39ccc64ec7fd7792ac037a",
+    "c7176a703d4dd84fba3c0b760d10670f2a2053fa2c39ccc64ec7fd7792ac03fa",
+    "26e8958fc2b227b045c3f489f2ef98f0d5dfac05d3c63339b13802886d53fc05",
+    "26e8958fc2b227b045c3f489f2ef98f0d5dfac05d3c63339b13802886d53fc85",
+]
+
+
+def b64(data: bytes) -> str:
+    return base64.b64encode(data).decode()
+
+
+@pytest.fixture(scope="module")
+def ed25519_signed():
+    """Ed25519 public key with a valid raw signature over MESSAGE."""
+    private_b64, public_pem = generate_ed25519_keypair()
+    signature = base64.b64decode(generate_device_signature(MESSAGE, private_b64))
+    return public_pem, signature
+
+
+class TestEd25519SignatureChecks:
+    """Test Ed25519 signature verification and malleability rejection."""
+    
+    def test_valid_signature_verifies(self, ed25519_signed):
+        """An untampered signature still verifies."""
+        public_pem, signature = ed25519_signed
+        assert verify_device_signature(MESSAGE, b64(signature), public_pem)
+    
+    def test_wrong_message_rejected(self, ed25519_signed):
+        """A valid signature does not verify a different message."""
+        public_pem, signature = ed25519_signed
+        assert not verify_device_signature(MESSAGE + "x", b64(signature), public_pem)
+    
+    @pytest.mark.parametrize("r_hex", SMALL_ORDER_R)
+    def test_small_order_r_rejected(self, ed25519_signed, r_hex):
+        """Each small-order R encoding is rejected."""
+        public_pem, signature = ed25519_signed
+        forged = bytes.fromhex(r_hex) + signature[32:]
+        assert not verify_device_signature(MESSAGE, b64(forged), public_pem)
+    
+    def test_s_equal_to_l_rejected(self, ed25519_signed):
+        """S = l is not a canonical scalar."""
+        public_pem, signature = ed25519_signed
+        forged = signature[:32] + ED25519_L.to_bytes(32, 'little')
+        assert not verify_device_signature(MESSAGE, b64(forged), public_pem)
+    
+    def test_s_plus_l_rejected(self, ed25519_signed):
+        """S + l (the malleated twin of a valid signature) is rejected."""
+        public_pem, signature = ed25519_signed
+        s = int.from_bytes(signature[32:], 'little')
+        forged = signature[:32] + (s + ED25519_L).to_bytes(32, 'little')
+        assert not verify_device_signature(MESSAGE, b64(forged), public_pem)
+    
+    @pytest.mark.parametrize("length", [63, 65])
+    def test_wrong_length_rejected(self, ed25519_signed, length):
+        """Signatures that are not exactly 64 bytes are rejected."""
+        public_pem, signature = ed25519_signed
+        forged = (signature + b'\x00')[:length]
+        assert not verify_device_signature(MESSAGE, b64(forged), public_pem)
+
+
+class TestNonEd25519KeyTypes:
+    """Test that the Ed25519-only checks do not apply to other key types."""
+    
+    def test_rsa_signature_skips_ed25519_checks(self):
+        """A valid RSA-PSS signature (not 64 bytes) verifies with key_type='rsa'."""
+        private_pem, public_pem = generate_rsa_keypair(key_size=2048)
+        signature_b64 = generate_device_signature(MESSAGE, private_pem, key_type="rsa")
+        
+        assert len(base64.b64decode(signature_b64)) != 64
+        assert verify_device_signature(MESSAGE, signature_b64, public_pem, key_type="rsa")
+        assert not verify_device_signature(MESSAGE, signature_b64, public_pem, key_type="ed25519")
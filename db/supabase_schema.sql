@@ -23,7 +23,8 @@ CREATE TABLE IF NOT EXISTS devices (
     id UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
     device_id TEXT UNIQUE NOT NULL,  -- 64 char hex string (32 bytes)
     pubkey_pem TEXT NOT NULL,         -- Public key in PEM format
-    id_prime TEXT NOT NULL,           -- Large integer stored as text
+    id_prime TEXT,                    -- Deprecated: decimal text, superseded by id_prime_bytes
+    id_prime_bytes BYTEA,             -- Large integer as big-endian bytes
     witness TEXT NOT NULL,            -- Accumulator witness (hex string)
     key_type TEXT NOT NULL DEFAULT 'ed25519' CHECK (key_type IN ('ed25519', 'rsa')),
     status INTEGER NOT NULL DEFAULT 1 CHECK (status IN (1, 2)), -- 1=ACTIVE, 2=REVOKED
@@ -31,16 +32,58 @@ CREATE TABLE IF NOT EXISTS devices (
     updated_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- Migration: id_prime text -> id_prime_bytes bytea
+-- (no-op on a fresh install; safe to re-run)
+ALTER TABLE devices ADD COLUMN IF NOT EXISTS id_prime_bytes BYTEA;
+ALTER TABLE devices ALTER COLUMN id_prime DROP NOT NULL;
+
+CREATE OR REPLACE FUNCTION decimal_text_to_bytea(value TEXT)
+RETURNS BYTEA AS $$
+DECLARE
+    n NUMERIC := value::NUMERIC;
+    hex TEXT := '';
+BEGIN
+    WHILE n > 0 LOOP
+        hex := lpad(to_hex((n % 256)::INTEGER), 2, '0') || hex;
+        n := div(n, 256);
+    END LOOP;
+    IF hex = '' THEN
+        hex := '00';
+    END IF;
+    RETURN decode(hex, 'hex');
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+UPDATE devices
+SET id_prime_bytes = decimal_text_to_bytea(id_prime)
+WHERE id_prime_bytes IS NULL AND id_prime IS NOT NULL;
+
 -- Create indexes for better query performance
-CREATE INDEX IF NOT EXISTS idx_devices_device_id ON devices(device_id);
-CREATE INDEX IF NOT EXISTS idx_devices_status ON devices(status);
+-- device_id's UNIQUE constraint already provides a btree; equality lookups
+-- (device_exists, get_device) use a hash index instead of a duplicate btree
+DROP INDEX IF EXISTS idx_devices_device_id;
+CREATE INDEX IF NOT EXISTS idx_devices_device_id_hash ON devices USING hash (device_id);
 CREATE INDEX IF NOT EXISTS idx_devices_key_type ON devices(key_type);
 CREATE INDEX IF NOT EXISTS idx_devices_created_at ON devices(created_at);
 
+-- get_all_devices(status=...) filters by status and orders by created_at;
+-- the composite index returns rows pre-sorted (and serves status-only
+-- lookups, replacing idx_devices_status)
+DROP INDEX IF EXISTS idx_devices_status;
+CREATE INDEX IF NOT EXISTS idx_devices_status_created ON devices(status, created_at);
+
+-- Active prime keyset pagination (status = 1 ORDER BY id) as an index-only scan
+CREATE INDEX IF NOT EXISTS idx_devices_status_id_prime ON devices(status, id) INCLUDE (id_prime_bytes, id_prime);
+
+-- Refresh planner statistics so the new indexes are picked up
+-- (run VACUUM ANALYZE devices; separately to also refresh the visibility map)
+ANALYZE devices;
+
 -- Add comments for documentation
 COMMENT ON TABLE devices IS 'IoT devices enrolled in the RSA accumulator system';
 COMMENT ON COLUMN devices.device_id IS 'SHA3-256 hash of public key DER (64 hex chars)';
-COMMENT ON COLUMN devices.id_prime IS 'Device identity prime number for accumulator';
+COMMENT ON COLUMN devices.id_prime IS 'Deprecated: decimal text of id_prime_bytes (legacy rows only)';
+COMMENT ON COLUMN devices.id_prime_bytes IS 'Device identity prime number for accumulator (big-endian bytes)';
 COMMENT ON COLUMN devices.witness IS 'Membership witness for accumulator proof';
 COMMENT ON COLUMN devices.status IS '1=ACTIVE, 2=REVOKED';
 
@@ -88,6 +131,82 @@ CREATE TRIGGER update_meta_updated_at
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
 
+-- ============================================
+-- Function: gateway_db_stats
+-- Device/meta counts and key type histogram in
+-- one call (used by get_db_stats via RPC)
+-- ============================================
+CREATE OR REPLACE FUNCTION gateway_db_stats()
+RETURNS JSON AS $$
+    SELECT json_build_object(
+        'total_devices', (SELECT count(*) FROM devices),
+        'active_devices', (SELECT count(*) FROM devices WHERE status = 1),
+        'revoked_devices', (SELECT count(*) FROM devices WHERE status = 2),
+        'meta_entries', (SELECT count(*) FROM meta),
+        'key_type_distribution', COALESCE(
+            (SELECT json_object_agg(key_type, cnt)
+             FROM (SELECT key_type, count(*) AS cnt FROM devices GROUP BY key_type) t),
+            '{}'::json
+        )
+    );
+$$ LANGUAGE sql STABLE;
+
+-- Retired: active primes are keyset-paged instead of one packed listing
+DROP FUNCTION IF EXISTS list_devices_binary(INTEGER);
+
+-- ============================================
+-- Function: bulk_update_witnesses
+-- Rewrite many witnesses in one statement
+-- (used after each accumulator change)
+-- ============================================
+CREATE OR REPLACE FUNCTION bulk_update_witnesses(ids TEXT[], wits TEXT[])
+RETURNS INTEGER AS $$
+    WITH updated AS (
+        UPDATE devices d
+        SET witness = v.w
+        FROM unnest(ids, wits) AS v(id, w)
+        WHERE d.device_id = v.id
+        RETURNING 1
+    )
+    SELECT count(*)::INTEGER FROM updated;
+$$ LANGUAGE sql;
+
+-- ============================================
+-- Function: bulk_update_statuses
+-- Apply many status changes in one statement
+-- (used by the gateway's status write batcher)
+-- ============================================
+CREATE OR REPLACE FUNCTION bulk_update_statuses(ids TEXT[], statuses INTEGER[])
+RETURNS INTEGER AS $$
+    WITH updated AS (
+        UPDATE devices d
+        SET status = v.s
+        FROM unnest(ids, statuses) AS v(id, s)
+        WHERE d.device_id = v.id
+        RETURNING 1
+    )
+    SELECT count(*)::INTEGER FROM updated;
+$$ LANGUAGE sql;
+
+-- ============================================
+-- Function: test_reset
+-- Empty devices and meta in O(1) for test runs.
+-- Refuses to run unless the database has
+--   ALTER DATABASE postgres SET app.env = 'test';
+-- ============================================
+CREATE OR REPLACE FUNCTION test_reset()
+RETURNS VOID AS $$
+BEGIN
+    IF current_setting('app.env', true) IS DISTINCT FROM 'test' THEN
+        RAISE EXCEPTION 'test_reset is only allowed when app.env = test';
+    END IF;
+    TRUNCATE TABLE devices, meta RESTART IDENTITY CASCADE;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+REVOKE EXECUTE ON FUNCTION test_reset() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION test_reset() TO service_role;
+
 -- ============================================
 -- Row Level Security (RLS)
 -- Enable RLS for secure access control
@@ -0,0 +1,123 @@
+"""
+Demo checks for gateway models and settings.
+
+Kept out of models.py/settings.py so importing those modules stays cheap.
+
+Usage:
+  python _demo.py            # models and settings
+  python _demo.py models     # models only
+"""
+
+import sys
+
+from models import EnrollRequest, AuthRequest, EnrollResponse, AuthResponse
+from settings import get_settings
+
+
+def demo_models():
+    """Test model validation."""
+    print("Testing Pydantic Models")
+    print("=" * 40)
+    
+    # Test EnrollRequest
+    try:
+        enroll_req = EnrollRequest(
+            publicKeyPEM="""-----BEGIN PUBLIC KEY-----
+MCowBQYDK2VwAyEAtest_key_data_here_32_bytes
+-----END PUBLIC KEY-----""",
+            keyType="ed25519"
+        )
+        print(f"✓ Valid EnrollRequest: {enroll_req.keyType}")
+    except Exception as e:
+        print(f"✗ EnrollRequest validation failed: {e}")
+    
+    # Test invalid keyType
+    try:
+        invalid_req = EnrollRequest(
+            publicKeyPEM="-----BEGIN PUBLIC KEY-----\ntest\n-----END PUBLIC KEY-----",
+            keyType="invalid"
+        )
+        print("✗ Should have failed validation")
+    except Exception as e:
+        print(f"✓ Correctly rejected invalid keyType: {e}")
+    
+    # Test AuthRequest
+    try:
+        auth_req = AuthRequest(
+            deviceIdHex="1234567890abcdef" * 8,  # 64 hex chars
+            idPrime=12345,
+            witnessHex="abcdef123456",
+            signatureB64="dGVzdA==",  # base64 "test"
+            nonceHex="deadbeef",
+            publicKeyPEM="-----BEGIN PUBLIC KEY-----\ntest\n-----END PUBLIC KEY-----",
+            keyType="ed25519"
+        )
+        print(f"✓ Valid AuthRequest: {auth_req.deviceIdHex[:16]}...")
+    except Exception as e:
+        print(f"✗ AuthRequest validation failed: {e}")
+    
+    # Test invalid deviceIdHex
+    try:
+        invalid_auth = AuthRequest(
+            deviceIdHex="invalid",  # Wrong length
+            idPrime=12345,
+            witnessHex="abc",
+            signatureB64="dGVzdA==",
+            nonceHex="deadbeef",
+            publicKeyPEM="-----BEGIN PUBLIC KEY-----\ntest\n-----END PUBLIC KEY-----"
+        )
+        print("✗ Should have failed validation")
+    except Exception as e:
+        print(f"✓ Correctly rejected invalid deviceIdHex: {e}")
+    
+    # Test Response models
+    enroll_resp = EnrollResponse(
+        deviceIdHex="1234567890abcdef" * 8,
+        idPrime=12345,
+        witnessHex="abcdef123456",
+        rootHex="fedcba987654"
+    )
+    print(f"✓ Valid EnrollResponse: {enroll_resp.idPrime}")
+    
+    auth_resp = AuthResponse(
+        ok=True,
+        newWitnessHex="updated_witness",
+        message="Authentication successful"
+    )
+    print(f"✓ Valid AuthResponse: {auth_resp.ok}")
+    
+    print("Model validation tests complete")
+
+
+def demo_settings():
+    """Test settings loading."""
+    settings = get_settings()
+    
+    print("IoT Identity Gateway Settings")
+    print("=" * 40)
+    print(f"RPC URL: {settings.rpc_url}")
+    print(f"Registry: {settings.registry_address}")
+    print(f"Database: {settings.db_path}")
+    print(f"Host: {settings.host}:{settings.port}")
+    print(f"N (first 20 chars): {settings.n_hex[:22]}...")
+    print(f"g: {settings.g_hex}")
+    print(f"λ(N) (first 20 chars): {settings.lambda_n_hex[:22]}...")
+    
+    # Test accumulator formatting
+    test_acc = settings.g  # Start with generator
+    hex_str = settings.format_accumulator_to_hex(test_acc)
+    print(f"Test accumulator hex (256 bytes): {hex_str[:32]}...{hex_str[-32:]}")
+    
+    parsed = settings.parse_accumulator_from_hex(hex_str)
+    print(f"Round-trip test: {test_acc == parsed}")
+
+
+def main():
+    demo_models()
+    if len(sys.argv) < 2 or sys.argv[1] != "models":
+        print()
+        demo_settings()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,761 @@
+"""
+Async Supabase Database Layer for IoT Identity Gateway
+
+PostgreSQL database via Supabase for storing device information,
+accumulator state, and metadata for the RSA accumulator system. Every call
+is awaitable so database I/O does not block the FastAPI event loop;
+supabase_db.SupabaseDatabaseManager is a blocking facade over this manager
+for scripts (migration, manual tests).
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Optional, List, Dict, Any, AsyncIterator, NamedTuple, Set, Tuple, Union
+import httpx
+import msgspec
+from cachetools import TTLCache
+from supabase import acreate_client, AsyncClient, AsyncClientOptions
+from postgrest.types import CountMethod, ReturnMethod
+
+from utils import hex_to_bytes
+
+try:
+    import asyncpg
+except ImportError:  # Optional: hot reads fall back to PostgREST
+    asyncpg = None
+
+logger = logging.getLogger(__name__)
+
+
+# Device status constants
+class DeviceStatus:
+    ACTIVE = 1
+    REVOKED = 2
+
+
+# Metadata keys constants
+class MetaKeys:
+    ROOT_HEX = "root_hex"
+    VERSION = "version"
+    N_HEX = "N_hex"
+    G_HEX = "g_hex"
+    LAMBDA_N_HEX = "lambda_n_hex"
+    LAST_SYNC = "last_sync"
+
+
+class DeviceKey(NamedTuple):
+    """Device ID with its hex form computed once, reusable across DB calls."""
+    raw: bytes
+    hex: str
+    
+    @classmethod
+    def from_bytes(cls, device_id: bytes) -> "DeviceKey":
+        return cls(device_id, device_id.hex())
+    
+    @classmethod
+    def from_hex(cls, device_id_hex: str) -> "DeviceKey":
+        device_id_hex = device_id_hex.lower()
+        return cls(hex_to_bytes(device_id_hex), device_id_hex)
+
+
+DeviceIdLike = Union[bytes, DeviceKey]
+
+
+def _device_id_hex(device_id: DeviceIdLike) -> str:
+    """Hex form of a device ID, reusing the precomputed one on a DeviceKey."""
+    return device_id.hex if isinstance(device_id, DeviceKey) else device_id.hex()
+
+
+def _prime_to_bytea(id_prime: Union[int, str]) -> str:
+    """
+    Encode an id_prime as a PostgREST bytea literal (big-endian, hex).
+    
+    Accepts the decimal string form too: the legacy SQLite store (and so
+    the migration script) keeps id_prime as TEXT.
+    """
+    id_prime = int(id_prime)
+    return '\\x' + id_prime.to_bytes((id_prime.bit_length() + 7) // 8 or 1, 'big').hex()
+
+
+def _prime_from_row(row: Dict[str, Any]) -> int:
+    """Decode a row's id_prime, preferring the bytea column over legacy text."""
+    raw = row.get('id_prime_bytes')
+    if raw:
+        return int.from_bytes(bytes.fromhex(raw[2:]), 'big')
+    return int(row['id_prime'])
+
+
+class DeviceRecord(msgspec.Struct, gc=False):
+    """A devices table row as returned by the database managers."""
+    device_id: bytes
+    pubkey_pem: str
+    id_prime: int
+    witness: str
+    key_type: str
+    status: int
+    created_at: str
+    updated_at: str
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict form, for callers that still index devices by key."""
+        return msgspec.structs.asdict(self)
+
+
+def _row_to_device(row: Dict[str, Any]) -> DeviceRecord:
+    """Convert a devices table row into a DeviceRecord."""
+    return DeviceRecord(
+        hex_to_bytes(row['device_id']),
+        row['pubkey_pem'],
+        _prime_from_row(row),
+        row['witness'],
+        row['key_type'],
+        row['status'],
+        row['created_at'],
+        row['updated_at']
+    )
+
+
+def _device_to_row(device: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a device dict into a devices table row for insertion."""
+    # Convert device_id bytes to hex and id_prime to big-endian bytea for PostgreSQL storage
+    return {
+        'device_id': _device_id_hex(device['device_id']),
+        'pubkey_pem': device['pubkey_pem'],
+        'id_prime_bytes': _prime_to_bytea(device['id_prime']),
+        'witness': device['witness'],
+        'key_type': device.get('key_type', 'ed25519'),
+        'status': device.get('status', 1)
+    }
+
+
+# Process-wide async Supabase client, shared by every AsyncSupabaseDatabaseManager
+_async_client_lock = asyncio.Lock()
+_shared_async_client: Optional[AsyncClient] = None
+_shared_async_client_key: Optional[Tuple[str, str]] = None
+
+
+async def _get_shared_async_client(supabase_url: str, supabase_key: str) -> AsyncClient:
+    """Get the shared async Supabase client, creating it on first use."""
+    global _shared_async_client, _shared_async_client_key
+    
+    async with _async_client_lock:
+        if _shared_async_client is None or _shared_async_client_key != (supabase_url, supabase_key):
+            http_client = httpx.AsyncClient(
+                http2=True,
+                timeout=10,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_keepalive_connections=15,
+                    max_connections=20,
+                    keepalive_expiry=30
+                )
+            )
+            options = AsyncClientOptions(
+                postgrest_client_timeout=10,
+                storage_client_timeout=10,
+                httpx_client=http_client
+            )
+            _shared_async_client = await acreate_client(supabase_url, supabase_key, options=options)
+            _shared_async_client_key = (supabase_url, supabase_key)
+        return _shared_async_client
+
+
+class AsyncSupabaseDatabaseManager:
+    """Manages Supabase PostgreSQL database for IoT identity system (async)."""
+    
+    def __init__(self, supabase_url: str, supabase_key: str, dsn: Optional[str] = None):
+        """
+        Initialize manager state; use ``create`` to also connect the client.
+        
+        Args:
+            supabase_url: Your Supabase project URL
+            supabase_key: Your Supabase anon/service role key
+            dsn: Optional direct Postgres connection string; when set (and
+                asyncpg is installed) hot reads bypass PostgREST
+        """
+        self.supabase_url = supabase_url
+        self.supabase_key = supabase_key
+        self.dsn = dsn
+        self.client: Optional[AsyncClient] = None
+        self._pg_pool = None
+        self._pg_pool_failed = False
+        self._pg_pool_lock = asyncio.Lock()
+        self._status_batcher: Optional["StatusBatcher"] = None
+        
+        # Short-lived cache for hot, rarely-changing reads (meta, active primes).
+        # Every mutator below clears it, so entries only outlive writes made by
+        # other processes, and then by at most the TTL.
+        self._meta_cache: TTLCache = TTLCache(maxsize=256, ttl=30)
+        self._meta_lock = threading.RLock()
+    
+    @classmethod
+    async def create(
+        cls, supabase_url: str, supabase_key: str, dsn: Optional[str] = None
+    ) -> "AsyncSupabaseDatabaseManager":
+        """Create a manager and connect its Supabase client."""
+        manager = cls(supabase_url, supabase_key, dsn=dsn)
+        try:
+            manager.client = await _get_shared_async_client(supabase_url, supabase_key)
+            logger.info(f"Connected to Supabase: {supabase_url}")
+        except Exception as e:
+            logger.error(f"Failed to connect to Supabase: {e}")
+            raise
+        return manager
+    
+    def invalidate_meta(self, key: Optional[str] = None) -> None:
+        """Drop cached reads; only those for one meta key when ``key`` is given."""
+        with self._meta_lock:
+            if key is None:
+                self._meta_cache.clear()
+            else:
+                self._meta_cache.pop(('meta', key), None)
+                self._meta_cache.pop(('all_meta',), None)
+    
+    async def _get_pg_pool(self):
+        """
+        Get the asyncpg pool, creating it on first use; None if unavailable.
+        
+        A failed connect is remembered so later reads go straight to
+        PostgREST instead of retrying the pool on every call.
+        """
+        if asyncpg is None or not self.dsn or self._pg_pool_failed:
+            return None
+        
+        async with self._pg_pool_lock:
+            if self._pg_pool is None and not self._pg_pool_failed:
+                try:
+                    self._pg_pool = await asyncpg.create_pool(
+                        self.dsn,
+                        min_size=2,
+                        max_size=10,
+                        statement_cache_size=100
+                    )
+                    logger.info("Opened direct Postgres pool")
+                except Exception as e:
+                    self._pg_pool_failed = True
+                    logger.warning(f"Direct Postgres unavailable, using PostgREST: {e}")
+        return self._pg_pool
+    
+    async def aclose(self) -> None:
+        """Write any queued status updates, then close the asyncpg pool if one was opened."""
+        if self._status_batcher is not None:
+            await self._status_batcher.aclose()
+        if self._pg_pool is not None:
+            await self._pg_pool.close()
+            self._pg_pool = None
+    
+    # Metadata operations
+    
+    async def get_meta(self, key: str) -> Optional[str]:
+        """Get metadata value by key."""
+        cache_key = ('meta', key)
+        with self._meta_lock:
+            if cache_key in self._meta_cache:
+                return self._meta_cache[cache_key]
+        
+        try:
+            pool = await self._get_pg_pool()
+            if pool is not None:
+                try:
+                    async with pool.acquire() as conn:
+                        value = await conn.fetchval('SELECT value FROM meta WHERE key = $1', key)
+                except Exception as e:
+                    logger.warning(f"Direct Postgres read of meta key '{key}' failed, using PostgREST: {e}")
+                    pool = None
+            if pool is None:
+                result = await self.client.table('meta').select('value').eq('key', key).execute()
+                value = result.data[0]['value'] if result.data else None
+            
+            with self._meta_lock:
+                self._meta_cache[cache_key] = value
+            return value
+        except Exception as e:
+            logger.error(f"Error getting meta key '{key}': {e}")
+            return None
+    
+    async def set_meta(self, key: str, value: str) -> None:
+        """Set metadata key-value pair (upsert)."""
+        try:
+            await self.client.table('meta').upsert({
+                'key': key,
+                'value': value
+            }).execute()
+            self.invalidate_meta()
+            logger.info(f"Set meta: {key}")
+        except Exception as e:
+            logger.error(f"Error setting meta key '{key}': {e}")
+            raise
+    
+    async def get_all_meta(self) -> Dict[str, str]:
+        """Get all metadata as dictionary."""
+        cache_key = ('all_meta',)
+        with self._meta_lock:
+            if cache_key in self._meta_cache:
+                return dict(self._meta_cache[cache_key])
+        
+        try:
+            result = await self.client.table('meta').select('key, value').execute()
+            meta = {row['key']: row['value'] for row in result.data}
+            with self._meta_lock:
+                self._meta_cache[cache_key] = meta
+            return dict(meta)
+        except Exception as e:
+            logger.error(f"Error getting all meta: {e}")
+            return {}
+    
+    # Device operations
+    
+    async def insert_device(
+        self,
+        device_id: DeviceIdLike,
+        pubkey_pem: str,
+        id_prime: int,
+        witness: str,
+        key_type: str = "ed25519",
+        status: int = 1
+    ) -> None:
+        """Insert new device into database."""
+        await self.bulk_insert_devices([{
+            'device_id': device_id,
+            'pubkey_pem': pubkey_pem,
+            'id_prime': id_prime,
+            'witness': witness,
+            'key_type': key_type,
+            'status': status
+        }])
+    
+    async def bulk_insert_devices(self, devices: List[Dict[str, Any]], chunk_size: int = 500) -> int:
+        """Insert many devices with one request per chunk of rows."""
+        try:
+            rows = [_device_to_row(device) for device in devices]
+            
+            for i in range(0, len(rows), chunk_size):
+                await self.client.table('devices').insert(rows[i:i + chunk_size]).execute()
+            self.invalidate_meta()
+            
+            if len(rows) == 1:
+                logger.info(f"Inserted device: {rows[0]['device_id']}")
+            else:
+                logger.info(f"Inserted {len(rows)} devices")
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Error inserting devices: {e}")
+            raise
+    
+    async def get_device(self, device_id: DeviceIdLike) -> Optional[DeviceRecord]:
+        """Get device by ID."""
+        try:
+            device_id_hex = _device_id_hex(device_id)
+            result = await self.client.table('devices').select('*').eq('device_id', device_id_hex).execute()
+            
+            if result.data:
+                return _row_to_device(result.data[0])
+            return None
+        except Exception as e:
+            logger.error(f"Error getting device: {e}")
+            return None
+    
+    async def get_devices_by_ids(self, device_ids: List[DeviceIdLike], chunk_size: int = 200) -> Dict[bytes, DeviceRecord]:
+        """Get many devices with one ``in`` query per chunk of IDs."""
+        try:
+            hexes = [_device_id_hex(device_id) for device_id in device_ids]
+            devices = {}
+            for i in range(0, len(hexes), chunk_size):
+                result = await self.client.table('devices').select('*').in_('device_id', hexes[i:i + chunk_size]).execute()
+                for row in result.data:
+                    device = _row_to_device(row)
+                    devices[device.device_id] = device
+            return devices
+        except Exception as e:
+            logger.error(f"Error getting devices by IDs: {e}")
+            return {}
+    
+    async def update_device_witness(self, device_id: DeviceIdLike, new_witness: str) -> bool:
+        """Update device witness."""
+        try:
+            device_id_hex = _device_id_hex(device_id)
+            result = await self.client.table('devices').update({
+                'witness': new_witness
+            }).eq('device_id', device_id_hex).execute()
+            
+            updated = len(result.data) > 0
+            self.invalidate_meta()
+            if updated:
+                logger.info(f"Updated witness for device: {device_id_hex}")
+            return updated
+        except Exception as e:
+            logger.error(f"Error updating device witness: {e}")
+            return False
+    
+    async def bulk_update_witnesses(self, pairs: List[Tuple[DeviceIdLike, str]], chunk_size: int = 5000) -> int:
+        """
+        Update many device witnesses with one bulk_update_witnesses RPC per chunk.
+        
+        Args:
+            pairs: (device_id, new_witness_hex) pairs
+            chunk_size: Maximum pairs per statement (bounds transaction size)
+        
+        Returns:
+            Number of devices updated
+        """
+        try:
+            updated = 0
+            for i in range(0, len(pairs), chunk_size):
+                chunk = pairs[i:i + chunk_size]
+                result = await self.client.rpc('bulk_update_witnesses', {
+                    'ids': [_device_id_hex(device_id) for device_id, _ in chunk],
+                    'wits': [witness for _, witness in chunk]
+                }).execute()
+                updated += result.data or 0
+            self.invalidate_meta()
+            
+            logger.info(f"Updated witnesses for {updated} devices")
+            return updated
+        except Exception as e:
+            logger.error(f"Error bulk updating witnesses: {e}")
+            raise
+    
+    async def update_device_status(self, device_id: DeviceIdLike, status: int) -> bool:
+        """Update device status."""
+        try:
+            device_id_hex = _device_id_hex(device_id)
+            result = await self.client.table('devices').update({
+                'status': status
+            }).eq('device_id', device_id_hex).execute()
+            
+            updated = len(result.data) > 0
+            self.invalidate_meta()
+            if updated:
+                logger.info(f"Updated status for device {device_id_hex} to {status}")
+            return updated
+        except Exception as e:
+            logger.error(f"Error updating device status: {e}")
+            return False
+    
+    async def bulk_update_statuses(self, pairs: List[Tuple[DeviceIdLike, int]]) -> int:
+        """Apply many (device_id, status) changes with one bulk_update_statuses RPC."""
+        try:
+            result = await self.client.rpc('bulk_update_statuses', {
+                'ids': [_device_id_hex(device_id) for device_id, _ in pairs],
+                'statuses': [status for _, status in pairs]
+            }).execute()
+            self.invalidate_meta()
+            
+            updated = result.data or 0
+            logger.info(f"Updated status for {updated} devices")
+            return updated
+        except Exception as e:
+            logger.error(f"Error bulk updating statuses: {e}")
+            raise
+    
+    async def queue_status_update(self, device_id: DeviceIdLike, status: int) -> None:
+        """
+        Update a device's status through the shared StatusBatcher.
+        
+        Returns once the batch containing this change has been written, so
+        concurrent callers (e.g. a burst of revocations) share one round-trip.
+        """
+        if self._status_batcher is None:
+            self._status_batcher = StatusBatcher(self)
+        await self._status_batcher.submit(device_id, status)
+    
+    async def get_all_devices(self, status: Optional[int] = None) -> List[DeviceRecord]:
+        """Get all devices, optionally filtered by status."""
+        try:
+            query = self.client.table('devices').select('*')
+            if status is not None:
+                query = query.eq('status', status)
+            
+            result = await query.order('created_at').execute()
+            return [_row_to_device(row) for row in result.data]
+        except Exception as e:
+            logger.error(f"Error getting all devices: {e}")
+            return []
+    
+    async def iter_all_devices(
+        self, status: Optional[int] = None, page_size: int = 500
+    ) -> AsyncIterator[DeviceRecord]:
+        """
+        Yield devices (optionally filtered by status) one page at a time.
+        
+        Pages are fetched with PostgREST range requests in get_all_devices
+        order, so callers can start sending rows before the last page arrives
+        and memory stays bounded by ``page_size``.
+        """
+        offset = 0
+        while True:
+            query = self.client.table('devices').select('*')
+            if status is not None:
+                query = query.eq('status', status)
+            
+            result = await query.order('created_at').order('id').range(offset, offset + page_size - 1).execute()
+            for row in result.data:
+                yield _row_to_device(row)
+            
+            if len(result.data) < page_size:
+                return
+            offset += page_size
+    
+    async def get_active_devices(self) -> List[DeviceRecord]:
+        """Get all active devices (status = 1)."""
+        return await self.get_all_devices(status=DeviceStatus.ACTIVE)
+    
+    async def get_active_primes(self) -> List[int]:
+        """Get list of id_primes for all active devices."""
+        cache_key = ('active_primes',)
+        with self._meta_lock:
+            if cache_key in self._meta_cache:
+                return list(self._meta_cache[cache_key])
+        
+        try:
+            pool = await self._get_pg_pool()
+            if pool is not None:
+                try:
+                    async with pool.acquire() as conn:
+                        rows = await conn.fetch(
+                            'SELECT id_prime_bytes, id_prime FROM devices WHERE status = $1',
+                            DeviceStatus.ACTIVE
+                        )
+                    primes = [
+                        int.from_bytes(row['id_prime_bytes'], 'big') if row['id_prime_bytes'] else int(row['id_prime'])
+                        for row in rows
+                    ]
+                except Exception as e:
+                    logger.warning(f"Direct Postgres read of active primes failed, using PostgREST: {e}")
+                    pool = None
+            if pool is None:
+                primes = [prime async for prime in self.iter_active_primes()]
+            
+            with self._meta_lock:
+                self._meta_cache[cache_key] = primes
+            return list(primes)
+        except Exception as e:
+            logger.error(f"Error getting active primes: {e}")
+            return []
+    
+    async def iter_active_primes(self, page_size: int = 5000) -> AsyncIterator[int]:
+        """
+        Yield id_primes of active devices, one keyset-paginated page at a time.
+        
+        Pages are ordered by the primary key and resumed with ``id > last_id``,
+        so memory stays bounded by ``page_size`` and consumers can start before
+        the last page arrives.
+        """
+        last_id: Optional[str] = None
+        while True:
+            query = self.client.table('devices').select('id, id_prime, id_prime_bytes').eq('status', DeviceStatus.ACTIVE)
+            if last_id is not None:
+                query = query.gt('id', last_id)
+            rows = (await query.order('id').limit(page_size).execute()).data
+            for row in rows:
+                yield _prime_from_row(row)
+            
+            if len(rows) < page_size:
+                return
+            last_id = rows[-1]['id']
+    
+    async def device_exists(self, device_id: DeviceIdLike) -> bool:
+        """Check if device exists in database."""
+        try:
+            device_id_hex = _device_id_hex(device_id)
+            result = await self.client.table('devices').select(
+                'device_id', count=CountMethod.exact, head=True
+            ).eq('device_id', device_id_hex).execute()
+            return (result.count or 0) > 0
+        except Exception as e:
+            logger.error(f"Error checking device existence: {e}")
+            return False
+    
+    async def get_device_count(self, status: Optional[int] = None) -> int:
+        """Get count of devices, optionally filtered by status."""
+        try:
+            query = self.client.table('devices').select('device_id', count=CountMethod.exact, head=True)
+            
+            if status is not None:
+                query = query.eq('status', status)
+            
+            result = await query.execute()
+            return result.count if result.count is not None else 0
+        except Exception as e:
+            logger.error(f"Error getting device count: {e}")
+            return 0
+    
+    # Utility methods
+    
+    async def clear_all_devices(self) -> int:
+        """Clear all devices (for testing). Returns count of deleted devices."""
+        try:
+            result = await self.client.table('devices').delete(
+                count=CountMethod.exact, returning=ReturnMethod.minimal
+            ).neq('device_id', '').execute()
+            self.invalidate_meta()
+            count = result.count or 0
+            
+            logger.warning(f"Cleared {count} devices from database")
+            return count
+        except Exception as e:
+            logger.error(f"Error clearing devices: {e}")
+            return 0
+    
+    async def clear_all_meta(self) -> int:
+        """Clear all metadata (for testing). Returns count of deleted entries."""
+        try:
+            result = await self.client.table('meta').delete(
+                count=CountMethod.exact, returning=ReturnMethod.minimal
+            ).neq('key', '').execute()
+            self.invalidate_meta()
+            count = result.count or 0
+            
+            logger.warning(f"Cleared {count} metadata entries from database")
+            return count
+        except Exception as e:
+            logger.error(f"Error clearing meta: {e}")
+            return 0
+    
+    async def reset_for_tests(self, safe: bool = False) -> None:
+        """
+        Empty the devices and meta tables (for testing).
+        
+        Args:
+            safe: Use the row-by-row clear_all_* deletes instead of the
+                test_reset RPC (which TRUNCATEs, and only runs when the
+                database has app.env = 'test')
+        """
+        if safe:
+            await self.clear_all_devices()
+            await self.clear_all_meta()
+            return
+        
+        try:
+            await self.client.rpc('test_reset').execute()
+            self.invalidate_meta()
+            logger.warning("Reset devices and meta tables")
+        except Exception as e:
+            logger.error(f"Error resetting database: {e}")
+            raise
+    
+    async def get_db_stats(self) -> Dict[str, Any]:
+        """Get database statistics (single gateway_db_stats RPC round-trip)."""
+        stats = {
+            'total_devices': 0,
+            'active_devices': 0,
+            'revoked_devices': 0,
+            'meta_entries': 0,
+            'key_type_distribution': {}
+        }
+        
+        try:
+            result = await self.client.rpc('gateway_db_stats').execute()
+            if result.data:
+                stats.update(result.data)
+        except Exception as e:
+            logger.error(f"Error getting database stats: {e}")
+        
+        stats['db_url'] = self.supabase_url
+        stats['db_type'] = 'Supabase PostgreSQL'
+        return stats
+
+
+class StatusBatcher:
+    """
+    Coalesces device status updates into bulk_update_statuses calls.
+    
+    Updates submitted within ``window`` seconds of the first pending one (or
+    until ``max_items`` are queued) are written together in one statement.
+    """
+    
+    def __init__(self, db: AsyncSupabaseDatabaseManager, window: float = 0.01, max_items: int = 100):
+        self.db = db
+        self.window = window
+        self.max_items = max_items
+        self._pending: List[Tuple[DeviceIdLike, int, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # The loop only holds weak references to tasks; keep in-flight flushes
+        # alive until they finish so their futures always resolve
+        self._tasks: Set[asyncio.Task] = set()
+    
+    def submit(self, device_id: DeviceIdLike, status: int) -> asyncio.Future:
+        """Queue a status change; the returned future resolves once it is written."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((device_id, status, future))
+        
+        if len(self._pending) == self.max_items:
+            self._spawn_flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.window, self._spawn_flush)
+        return future
+    
+    def _spawn_flush(self) -> None:
+        """Start a flush task and hold a reference to it until it is done."""
+        task = asyncio.get_running_loop().create_task(self._flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def aclose(self) -> None:
+        """Write everything still queued and wait for in-flight flushes."""
+        while self._pending:
+            await self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+    
+    async def _flush(self) -> None:
+        """Write all pending status changes in one RPC."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        
+        batch, self._pending = self._pending[:self.max_items], self._pending[self.max_items:]
+        if not batch:
+            return
+        if self._pending:
+            self._spawn_flush()
+        
+        try:
+            await self.db.bulk_update_statuses([(device_id, status) for device_id, status, _ in batch])
+        except asyncio.CancelledError:
+            for _, _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for _, _, future in batch:
+            if not future.done():
+                future.set_result(None)
+
+
+def main():
+    """Test async database operations (sync entry point via asyncio.run)."""
+    import os
+    from dotenv import load_dotenv
+    
+    load_dotenv()
+    
+    supabase_url = os.getenv("SUPABASE_URL")
+    supabase_key = os.getenv("SUPABASE_KEY")
+    
+    if not supabase_url or not supabase_key:
+        print("⚠️  Please set SUPABASE_URL and SUPABASE_KEY in .env file")
+        return
+    
+    async def run():
+        db = await AsyncSupabaseDatabaseManager.create(
+            supabase_url, supabase_key, dsn=os.getenv("SUPABASE_DB_URL") or None
+        )
+        try:
+            print(f"Root hex: {await db.get_meta(MetaKeys.ROOT_HEX)}")
+            print(f"Version: {await db.get_meta(MetaKeys.VERSION)}")
+            print(f"Database stats: {await db.get_db_stats()}")
+        finally:
+            await db.aclose()
+    
+    asyncio.run(run())
+    print("\n✅ Test complete")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,7 @@ from web3 import Web3
 from web3.contract import Contract
 from eth_account import Account
 
-from settings import settings
+from settings import Settings, get_settings
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -22,25 +22,30 @@ logger = logging.getLogger(__name__)
 class ChainClient:
     """Web3 client for RegistryMock contract interactions."""
     
-    def __init__(self):
-        # Initialize Web3 connection
-        self.w3 = Web3(Web3.HTTPProvider(settings.rpc_url))
+    def __init__(self, settings: Optional[Settings] = None):
+        self.settings = settings or get_settings()
+        
+        # Reuse the Web3 connection behind the shared registry contract
+        self.w3 = self.settings.registry_contract.w3
         
         # Validate connection
         if not self.w3.is_connected():
-            raise ConnectionError(f"Cannot connect to blockchain at {settings.rpc_url}")
+            raise ConnectionError(f"Cannot connect to blockchain at {self.settings.rpc_url}")
         
         # Set up account from private key
-        self.account = Account.from_key(settings.private_key_admin)
+        self.account = Account.from_key(self.settings.private_key_admin)
         self.w3.eth.default_account = self.account.address
         
         # Initialize contract
         self.contract = self._init_contract()
         
+        # EIP-712 domain separator for the Safe (computed on first use)
+        self._domain_separator: Optional[bytes] = None
+        
         logger.info(f"ChainClient initialized")
-        logger.info(f"Connected to: {settings.rpc_url}")
+        logger.info(f"Connected to: {self.settings.rpc_url}")
         logger.info(f"Account: {self.account.address}")
-        logger.info(f"Registry: {settings.registry_address}")
+        logger.info(f"Registry: {self.settings.registry_address}")
         
         # Verify we're the owner
         self._verify_ownership()
@@ -48,10 +53,7 @@ class ChainClient:
     def _init_contract(self) -> Contract:
         """Initialize contract instance."""
         try:
-            contract = self.w3.eth.contract(
-                address=Web3.to_checksum_address(settings.registry_address),
-                abi=settings.get_registry_abi()
-            )
+            contract = self.settings.registry_contract
             
             # Test contract connectivity
             state = contract.functions.getCurrentState().call()
@@ -69,7 +71,7 @@ class ChainClient:
     def _verify_ownership(self) -> None:
         """Verify Safe configuration."""
         logger.info("Multi-sig mode: Safe-based authorization")
-        logger.info(f"Contract controlled by Safe: {settings.safe_address}")
+        logger.info(f"Contract controlled by Safe: {self.settings.safe_address}")
         return
     
     def get_state(self) -> Tuple[str, str, int]:
@@ -134,7 +136,7 @@ class ChainClient:
         
         # Encode the call data for the target contract
         call_data = tx_function(*args).build_transaction({
-            'from': settings.safe_address,
+            'from': self.settings.safe_address,
             'gas': 2000000,
             'gasPrice': 0,
         })['data']
@@ -146,7 +148,7 @@ class ChainClient:
         ]
         
         safe_contract = self.w3.eth.contract(
-            address=Web3.to_checksum_address(settings.safe_address),
+            address=Web3.to_checksum_address(self.settings.safe_address),
             abi=safe_abi_minimal
         )
         
@@ -154,7 +156,7 @@ class ChainClient:
         nonce = safe_contract.functions.nonce().call()
         
         # Transaction parameters for Safe
-        to = settings.registry_address
+        to = self.settings.registry_address
         value = 0
         data = call_data
         operation = 0  # Call
@@ -168,17 +170,7 @@ class ChainClient:
         from eth_abi import encode
         
         # Calculate Safe transaction hash (EIP-712)
-        # Domain separator
-        domain_separator = self.w3.keccak(
-            encode(
-                ['bytes32', 'uint256', 'address'],
-                [
-                    self.w3.keccak(text="EIP712Domain(uint256 chainId,address verifyingContract)"),
-                    31337,  # Anvil chain ID
-                    Web3.to_checksum_address(settings.safe_address)
-                ]
-            )
-        )
+        domain_separator = self._get_domain_separator()
         
         # Safe tx type hash
         safe_tx_typehash = self.w3.keccak(
@@ -232,6 +224,23 @@ class ChainClient:
         
         return safe_tx_hash, tx_params
 
+    def _get_domain_separator(self) -> bytes:
+        """Get the Safe's EIP-712 domain separator, computing it once."""
+        if self._domain_separator is None:
+            from eth_abi import encode
+            
+            self._domain_separator = self.w3.keccak(
+                encode(
+                    ['bytes32', 'uint256', 'address'],
+                    [
+                        self.w3.keccak(text="EIP712Domain(uint256 chainId,address verifyingContract)"),
+                        31337,  # Anvil chain ID
+                        Web3.to_checksum_address(self.settings.safe_address)
+                    ]
+                )
+            )
+        return self._domain_separator
+
     @staticmethod
     def _to_bytes(hex_str: str) -> bytes:
         """Convert hex string (with or without 0x) to bytes."""
@@ -368,8 +377,8 @@ class ChainClient:
                 'account_address': self.account.address,
                 'account_balance_wei': balance,
                 'account_balance_eth': self.w3.from_wei(balance, 'ether'),
-                'registry_address': settings.registry_address,
-                'rpc_url': settings.rpc_url
+                'registry_address': self.settings.registry_address,
+                'rpc_url': self.settings.rpc_url
             }
         except Exception as e:
             return {
@@ -380,10 +389,10 @@ class ChainClient:
     def get_safe_info(self) -> dict:
         """Get Gnosis Safe configuration."""
         return {
-            "safe_address": settings.safe_address,
-            "registry_address": settings.registry_address,
-            "threshold": settings.safe_threshold,
-            "owners": [owner.lower() for owner in settings.safe_owners]
+            "safe_address": self.settings.safe_address,
+            "registry_address": self.settings.registry_address,
+            "threshold": self.settings.safe_threshold,
+            "owners": [owner.lower() for owner in self.settings.safe_owners]
         }
 
 
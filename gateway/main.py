@@ -7,15 +7,17 @@ using RSA accumulator with trapdoor operations.
 
 import os
 import sys
+import asyncio
 import logging
 import hashlib
 import secrets
 import traceback
 from datetime import datetime
 from typing import Dict, Any, Optional
-from fastapi import FastAPI, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from pydantic import ValidationError
 from cryptography.hazmat.primitives import serialization
 
 # Add parent directory to path for importing accumulator modules
@@ -25,13 +27,15 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from accum.accumulator import add_member, verify_membership
 from accum.trapdoor_operations import trapdoor_remove_member_with_lambda
 from accum.hash_to_prime import hash_to_prime_coprime_lambda
-from accum.rsa_key_generator import verify_device_signature
+from accum.rsa_key_generator import load_public_key, verify_device_signature
 from accum.rsa_key_generator import generate_ed25519_keypair, generate_rsa_keypair
 from accum.witness_refresh import update_witness_on_addition, refresh_witness
 
 # Import gateway modules  
-from settings import settings
-from supabase_db import SupabaseDatabaseManager as DatabaseManager, DeviceStatus, MetaKeys
+from settings import Settings, get_settings
+from async_supabase_db import (
+    AsyncSupabaseDatabaseManager as DatabaseManager, DeviceKey, DeviceStatus, MetaKeys
+)
 from chain_client import ChainClient
 from models import (
     EnrollRequest, EnrollResponse,
@@ -40,7 +44,7 @@ from models import (
     RootResponse, StatusResponse,
     KeyGenRequest, KeyGenResponse,
     WitnessResponse,
-    DeviceListResponse,
+    DeviceListResponse, DEVICE_LIST_ADAPTER, DEVICE_ROW_ADAPTER, DEVICE_ID_ADAPTER,
     ErrorResponse
 )
 
@@ -72,20 +76,34 @@ db: DatabaseManager = None
 chain: ChainClient = None
 
 
+async def get_db() -> DatabaseManager:
+    """Get the shared database manager (usable as a FastAPI dependency)."""
+    global db
+    if db is None:
+        settings = get_settings()
+        db = await DatabaseManager.create(
+            settings.supabase_url,
+            settings.supabase_key,
+            dsn=settings.supabase_db_url or None
+        )
+    return db
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize application on startup."""
-    global db, chain
+    global chain
     
     try:
         logger.info("Starting IoT Identity Gateway...")
+        settings = get_settings()
         
         # Initialize database
-        db = DatabaseManager(settings.supabase_url, settings.supabase_key)
+        await get_db()
         logger.info("Database initialized")
         
         # Initialize blockchain client
-        chain = ChainClient()
+        chain = ChainClient(settings)
         logger.info("Blockchain client initialized")
         
         # Seed database with RSA parameters if not present
@@ -102,12 +120,20 @@ async def startup_event():
         raise
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release database connections on shutdown."""
+    if db is not None:
+        await db.aclose()
+
+
 async def _seed_initial_data():
     """Seed database with initial RSA parameters."""
-    if not db.get_meta(MetaKeys.N_HEX):
-        db.set_meta(MetaKeys.N_HEX, settings.n_hex)
-        db.set_meta(MetaKeys.G_HEX, settings.g_hex) 
-        db.set_meta(MetaKeys.LAMBDA_N_HEX, settings.lambda_n_hex)
+    settings = get_settings()
+    if not await db.get_meta(MetaKeys.N_HEX):
+        await db.set_meta(MetaKeys.N_HEX, settings.n_hex)
+        await db.set_meta(MetaKeys.G_HEX, settings.g_hex) 
+        await db.set_meta(MetaKeys.LAMBDA_N_HEX, settings.lambda_n_hex)
         logger.info("Seeded RSA parameters into database")
 
 
@@ -118,8 +144,8 @@ async def _sync_blockchain_state():
         acc_hex, hash_hex, version = chain.get_state()
         
         # Update database metadata
-        db.set_meta(MetaKeys.ROOT_HEX, acc_hex)
-        db.set_meta(MetaKeys.VERSION, str(version))
+        await db.set_meta(MetaKeys.ROOT_HEX, acc_hex)
+        await db.set_meta(MetaKeys.VERSION, str(version))
         
         logger.info(f"Synced with blockchain: version={version}")
         
@@ -131,8 +157,8 @@ async def _sync_blockchain_state():
 def _compute_device_id(public_key_pem: str) -> bytes:
     """Compute device ID from public key DER."""
     try:
-        # Load public key and get DER format
-        public_key = serialization.load_pem_public_key(public_key_pem.encode())
+        # Load public key (cached per PEM) and get DER format
+        public_key = load_public_key(public_key_pem)
         der_bytes = public_key.public_bytes(
             encoding=serialization.Encoding.DER,
             format=serialization.PublicFormat.SubjectPublicKeyInfo
@@ -168,7 +194,10 @@ def _handle_error(e: Exception, default_message: str) -> JSONResponse:
 
 
 @app.post("/enroll", response_model=EnrollResponse)
-async def enroll_device(request: EnrollRequest) -> JSONResponse:
+async def enroll_device(
+    request: EnrollRequest,
+    settings: Settings = Depends(get_settings)
+) -> JSONResponse:
     """
     Enroll a new IoT device in the accumulator.
     
@@ -184,14 +213,15 @@ async def enroll_device(request: EnrollRequest) -> JSONResponse:
         
         # Compute device ID
         device_id = _compute_device_id(request.publicKeyPEM)
-        device_id_hex = device_id.hex()
+        device_key = DeviceKey.from_bytes(device_id)
+        device_id_hex = device_key.hex
         
         # Check if device already exists
-        if db.device_exists(device_id):
+        if await db.device_exists(device_key):
             raise ValueError(f"Device already enrolled: {device_id_hex}")
         
-        # Get DER bytes for prime generation
-        public_key = serialization.load_pem_public_key(request.publicKeyPEM.encode())
+        # Get DER bytes for prime generation (key already parsed above)
+        public_key = load_public_key(request.publicKeyPEM)
         der_bytes = public_key.public_bytes(
             encoding=serialization.Encoding.DER,
             format=serialization.PublicFormat.SubjectPublicKeyInfo
@@ -202,7 +232,7 @@ async def enroll_device(request: EnrollRequest) -> JSONResponse:
         logger.info(f"Generated prime: {id_prime}")
         
         # Get current accumulator state
-        current_root_hex = db.get_meta(MetaKeys.ROOT_HEX)
+        current_root_hex = await db.get_meta(MetaKeys.ROOT_HEX)
         if not current_root_hex:
             raise ValueError("Accumulator state not initialized")
         
@@ -258,19 +288,19 @@ async def enroll_device(request: EnrollRequest) -> JSONResponse:
         )
         # When a new device is added, all existing witnesses become stale
         # We use trapdoor division to compute: witness = new_root^(1/prime) mod N
-        active_devices = db.get_active_devices()
+        active_devices = await db.get_active_devices()
         
         # Get the NEW accumulator root (after syncing with blockchain)
-        new_root_after_sync_hex = db.get_meta(MetaKeys.ROOT_HEX)
+        new_root_after_sync_hex = await db.get_meta(MetaKeys.ROOT_HEX)
         new_root_after_sync = settings.parse_accumulator_from_hex(new_root_after_sync_hex)
         
-        refreshed_count = 0
+        witness_updates = []
         for device in active_devices:
             # Skip the newly enrolled device (it already has correct witness)
-            if device['device_id'] == device_id:
+            if device.device_id == device_id:
                 continue
                 
-            device_prime = device['id_prime']
+            device_prime = device.id_prime
             if isinstance(device_prime, str):
                 device_prime = int(device_prime)
                 
@@ -285,9 +315,10 @@ async def enroll_device(request: EnrollRequest) -> JSONResponse:
             )
             fresh_witness_hex = settings.format_accumulator_to_hex(fresh_witness)
             
-            # Update witness in database
-            db.update_device_witness(device['device_id'], fresh_witness_hex)
-            refreshed_count += 1
+            witness_updates.append((device.device_id, fresh_witness_hex))
+        
+        # Write all refreshed witnesses in one statement
+        refreshed_count = await db.bulk_update_witnesses(witness_updates)
             
         logger.info(f"Device enrolled successfully: {device_id_hex}")
         logger.info(f"Refreshed witnesses for {refreshed_count} existing devices")
@@ -307,7 +338,10 @@ async def enroll_device(request: EnrollRequest) -> JSONResponse:
 
 
 @app.post("/auth", response_model=AuthResponse) 
-async def authenticate_device(request: AuthRequest) -> JSONResponse:
+async def authenticate_device(
+    request: AuthRequest,
+    settings: Settings = Depends(get_settings)
+) -> JSONResponse:
     """
     Authenticate a device using membership proof and signature.
     
@@ -321,26 +355,25 @@ async def authenticate_device(request: AuthRequest) -> JSONResponse:
         logger.info(f"Authenticating device: {request.deviceIdHex}")
         
         # Get device from database
-        device_id = bytes.fromhex(request.deviceIdHex)
-        device = db.get_device(device_id)
+        device = await db.get_device(DeviceKey.from_hex(request.deviceIdHex))
         
         if not device:
             raise ValueError("Device not found")
         
-        if device['status'] != DeviceStatus.ACTIVE:
+        if device.status != DeviceStatus.ACTIVE:
             raise ValueError("Device is not active")
         
         # Verify device identity matches
-        if device['id_prime'] != request.idPrime:
+        if device.id_prime != request.idPrime:
             raise ValueError("Identity prime mismatch")
         
         # Get current accumulator root
-        current_root_hex = db.get_meta(MetaKeys.ROOT_HEX)
+        current_root_hex = await db.get_meta(MetaKeys.ROOT_HEX)
         current_root = settings.parse_accumulator_from_hex(current_root_hex)
         
         # Parse witness from request
         witness_int = int(request.witnessHex, 16)
-        stored_witness_hex = device['witness']
+        stored_witness_hex = device.witness
         new_witness_hex = None
         
         # Verify membership proof: witness^prime ≡ root (mod N)
@@ -365,15 +398,21 @@ async def authenticate_device(request: AuthRequest) -> JSONResponse:
             new_witness_hex = stored_witness_hex
         
         # Verify cryptographic signature (signing is over the nonce hex string itself)
-        is_signature_valid = verify_device_signature(
+        # against the key stored at enrollment. CPU-bound, so run it off the event loop.
+        is_signature_valid = await asyncio.to_thread(
+            verify_device_signature,
             message=request.nonceHex,
             signature_base64=request.signatureB64,
-            public_key_pem=request.publicKeyPEM,
-            key_type=request.keyType
+            public_key_pem=device.pubkey_pem,
+            key_type=device.key_type
         )
         
         if not is_signature_valid:
-            raise ValueError("Signature verification failed")
+            logger.warning(f"Signature verification failed for device: {request.deviceIdHex}")
+            return JSONResponse(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                content={"error": "Signature verification failed", "code": "AUTH_FAILED"}
+            )
         
         # Authentication successful
         logger.info(f"Device authenticated successfully: {request.deviceIdHex}")
@@ -392,7 +431,10 @@ async def authenticate_device(request: AuthRequest) -> JSONResponse:
 
 
 @app.post("/revoke", response_model=RevokeResponse)
-async def revoke_device(request: RevokeRequest) -> JSONResponse:
+async def revoke_device(
+    request: RevokeRequest,
+    settings: Settings = Depends(get_settings)
+) -> JSONResponse:
     """
     Revoke a device using trapdoor operations.
     
@@ -406,30 +448,29 @@ async def revoke_device(request: RevokeRequest) -> JSONResponse:
         logger.info(f"Revoking device: {request.deviceIdHex}")
         
         # Get device from database
-        device_id = bytes.fromhex(request.deviceIdHex)
-        device = db.get_device(device_id)
+        device = await db.get_device(DeviceKey.from_hex(request.deviceIdHex))
         
         if not device:
             raise ValueError("Device not found")
         
-        if device['status'] != DeviceStatus.ACTIVE:
+        if device.status != DeviceStatus.ACTIVE:
             raise ValueError("Device is not active")
         
         # Get current accumulator state
-        current_root_hex = db.get_meta(MetaKeys.ROOT_HEX)
+        current_root_hex = await db.get_meta(MetaKeys.ROOT_HEX)
         current_root = settings.parse_accumulator_from_hex(current_root_hex)
         
         # Remove device using trapdoor operation
         # This is the key requirement: MUST use trapdoor operations
         new_root = trapdoor_remove_member_with_lambda(
             A=current_root,
-            prime=device['id_prime'],
+            prime=device.id_prime,
             N=settings.N,
             lambda_n=settings.lambda_n
         )
         new_root_hex = settings.format_accumulator_to_hex(new_root)
         
-        logger.info(f"Trapdoor removal complete: {device['id_prime']}")
+        logger.info(f"Trapdoor removal complete: {device.id_prime}")
         
         # Update blockchain (multi-sig mode only)
         result = chain.revoke_device(request.deviceIdHex, new_root_hex)
@@ -445,7 +486,7 @@ async def revoke_device(request: RevokeRequest) -> JSONResponse:
             'type': 'revokeDevice',
             'device_id': request.deviceIdHex,
             'deviceIdHex': request.deviceIdHex,
-            'id_prime': str(device['id_prime']),
+            'id_prime': str(device.id_prime),
             'newAccumulator': new_root_hex,
             'oldAccumulator': current_root_hex,
             # Safe transaction parameters from chain_client
@@ -481,8 +522,8 @@ async def get_accumulator_root() -> JSONResponse:
         # Sync with blockchain to get latest state
         await _sync_blockchain_state()
         
-        root_hex = db.get_meta(MetaKeys.ROOT_HEX)
-        version_str = db.get_meta(MetaKeys.VERSION)
+        root_hex = await db.get_meta(MetaKeys.ROOT_HEX)
+        version_str = await db.get_meta(MetaKeys.VERSION)
         
         if not root_hex or not version_str:
             raise ValueError("Accumulator state not initialized")
@@ -504,13 +545,13 @@ async def get_system_status() -> JSONResponse:
     """Get system status and health information."""
     try:
         # Get database stats
-        db_stats = db.get_db_stats()
+        db_stats = await db.get_db_stats()
         
         # Check blockchain connection
         chain_info = chain.get_chain_info()
         
         # Get current version
-        version_str = db.get_meta(MetaKeys.VERSION) or "0"
+        version_str = await db.get_meta(MetaKeys.VERSION) or "0"
         
         return JSONResponse(
             status_code=status.HTTP_200_OK,
@@ -573,8 +614,17 @@ async def generate_keys(req: KeyGenRequest) -> JSONResponse:
         return _handle_error(e, "Key generation failed")
 
 
+def parse_device_id(device_id_hex: str) -> DeviceKey:
+    """Parse a device ID path parameter once into a reusable DeviceKey."""
+    try:
+        device_id_hex = DEVICE_ID_ADAPTER.validate_python(device_id_hex)
+    except ValidationError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Device ID must be 64 hex characters")
+    return DeviceKey.from_hex(device_id_hex)
+
+
 @app.get("/witness/{device_id_hex}", response_model=WitnessResponse)
-async def get_device_witness(device_id_hex: str) -> JSONResponse:
+async def get_device_witness(device_key: DeviceKey = Depends(parse_device_id)) -> JSONResponse:
     """
     Get the current witness for a specific device.
     
@@ -582,13 +632,8 @@ async def get_device_witness(device_id_hex: str) -> JSONResponse:
     which is kept fresh by enrollment and revocation operations.
     """
     try:
-        # Validate device ID format
-        if len(device_id_hex) != 64:
-            raise ValueError("Device ID must be 64 hex characters")
-        
         # Get device from database
-        device_id = bytes.fromhex(device_id_hex)
-        device = db.get_device(device_id)
+        device = await db.get_device(device_key)
         
         if not device:
             raise ValueError("Device not found")
@@ -602,10 +647,11 @@ async def get_device_witness(device_id_hex: str) -> JSONResponse:
         return JSONResponse(
             status_code=status.HTTP_200_OK,
             content=WitnessResponse(
-                deviceIdHex=device_id_hex.lower(),
-                witnessHex=device['witness'],
-                status=status_map.get(device['status'], 'unknown'),
-                lastUpdated=device['updated_at']
+                deviceIdHex=device_key.hex,
+                witnessHex=device.witness,
+                idPrime=device.id_prime,
+                status=status_map.get(device.status, 'unknown'),
+                lastUpdated=device.updated_at
             ).dict()
         )
         
@@ -644,43 +690,44 @@ async def get_devices(status_filter: Optional[str] = None) -> JSONResponse:
                 raise ValueError(f"Invalid status filter: {status_filter}. Use 'active' or 'revoked'")
         
         # Get devices from database
-        devices_data = db.get_all_devices(status=status_int)
+        devices_data = await db.get_all_devices(status=status_int)
         logger.info(f"Retrieved {len(devices_data)} devices from database")
         
         # Convert to response model
         device_list = []
         for device in devices_data:
             try:
-                # Handle both bytes and string device_id
-                device_id_hex = device['device_id'].hex() if isinstance(device['device_id'], bytes) else device['device_id']
+                device_id_hex = device.device_id.hex()
                 
                 device_list.append({
                     'deviceIdHex': device_id_hex,
-                    'keyType': device['key_type'],
-                    'idPrime': device['id_prime'],
-                    'status': device['status'],
-                    'createdAt': device['created_at'],
-                    'updatedAt': device['updated_at']
+                    'keyType': device.key_type,
+                    'idPrime': device.id_prime,
+                    'status': device.status,
+                    'createdAt': device.created_at,
+                    'updatedAt': device.updated_at
                 })
             except Exception as e:
                 logger.error(f"Error processing device: {e}, device data: {device}")
                 continue
         
         # Count by status
-        all_devices = db.get_all_devices() if status_int else devices_data
-        active_count = sum(1 for d in all_devices if d['status'] == DeviceStatus.ACTIVE)
-        revoked_count = sum(1 for d in all_devices if d['status'] == DeviceStatus.REVOKED)
+        all_devices = await db.get_all_devices() if status_int else devices_data
+        active_count = sum(1 for d in all_devices if d.status == DeviceStatus.ACTIVE)
+        revoked_count = sum(1 for d in all_devices if d.status == DeviceStatus.REVOKED)
         
         logger.info(f"Returning {len(device_list)} devices (active: {active_count}, revoked: {revoked_count})")
         
-        return JSONResponse(
+        # Serialize the device rows in pydantic-core and splice in the counts
+        devices_json = DEVICE_LIST_ADAPTER.dump_json(device_list)
+        body = b'{"devices":%b,"total":%d,"active":%d,"revoked":%d}' % (
+            devices_json, len(all_devices), active_count, revoked_count
+        )
+        
+        return Response(
+            content=body,
             status_code=status.HTTP_200_OK,
-            content={
-                'devices': device_list,
-                'total': len(all_devices),
-                'active': active_count,
-                'revoked': revoked_count
-            }
+            media_type="application/json"
         )
         
     except ValueError as e:
@@ -692,6 +739,41 @@ async def get_devices(status_filter: Optional[str] = None) -> JSONResponse:
         return _handle_error(e, "Failed to fetch devices")
 
 
+@app.get("/devices/stream")
+async def stream_devices(status_filter: Optional[str] = None) -> StreamingResponse:
+    """
+    Stream devices as newline-delimited JSON, one device per line.
+    
+    Unlike /devices, rows are sent as each database page arrives, so clients
+    can start consuming large listings immediately (no totals are included).
+    
+    Query Parameters:
+        status_filter: Filter by status ('active', 'revoked', or omit for all)
+    """
+    status_map = {'active': DeviceStatus.ACTIVE, 'revoked': DeviceStatus.REVOKED}
+    status_int = None
+    if status_filter:
+        status_int = status_map.get(status_filter.lower())
+        if status_int is None:
+            return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={"error": f"Invalid status filter: {status_filter}. Use 'active' or 'revoked'", "code": "INVALID_REQUEST"}
+            )
+    
+    async def ndjson_lines():
+        async for device in db.iter_all_devices(status=status_int):
+            yield DEVICE_ROW_ADAPTER.dump_json({
+                'deviceIdHex': device.device_id.hex(),
+                'keyType': device.key_type,
+                'idPrime': device.id_prime,
+                'status': device.status,
+                'createdAt': device.created_at,
+                'updatedAt': device.updated_at
+            }) + b'\n'
+    
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
 # Global exception handler
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
@@ -701,7 +783,7 @@ async def http_exception_handler(request, exc):
         content=ErrorResponse(
             error=exc.detail,
             code="HTTP_ERROR"
-        ).dict()
+        ).model_dump()
     )
 
 
@@ -716,7 +798,7 @@ async def general_exception_handler(request, exc):
         content=ErrorResponse(
             error="Internal server error",
             code="INTERNAL_ERROR"
-        ).dict()
+        ).model_dump()
     )
 
 
@@ -821,7 +903,10 @@ async def sign_transaction(signature_data: Dict[str, Any]):
 
 
 @app.post("/multisig/execute")
-async def execute_transaction(execution_data: Dict[str, Any]):
+async def execute_transaction(
+    execution_data: Dict[str, Any],
+    settings: Settings = Depends(get_settings)
+):
     """Mark transaction as executed and process the operation."""
     try:
         safe_tx_hash = execution_data["safeTxHash"]
@@ -844,9 +929,9 @@ async def execute_transaction(execution_data: Dict[str, Any]):
             await _sync_blockchain_state()
             
             # Store device in database
-            device_id = bytes.fromhex(tx["device_id"])
-            db.insert_device(
-                device_id=device_id,
+            device_key = DeviceKey.from_hex(tx["device_id"])
+            await db.insert_device(
+                device_id=device_key,
                 pubkey_pem=tx["pubkey_pem"],
                 id_prime=int(tx["id_prime"]),
                 witness=tx["witness"],  # Old accumulator (witness for membership proof)
@@ -856,17 +941,17 @@ async def execute_transaction(execution_data: Dict[str, Any]):
             logger.info(f"Device {tx['device_id'][:16]}... stored in database")
             
             # Refresh witnesses for all existing active devices
-            active_devices = db.get_active_devices()
-            new_root_hex = db.get_meta(MetaKeys.ROOT_HEX)
+            active_devices = await db.get_active_devices()
+            new_root_hex = await db.get_meta(MetaKeys.ROOT_HEX)
             new_root = settings.parse_accumulator_from_hex(new_root_hex)
             
-            refreshed_count = 0
+            witness_updates = []
             for dev in active_devices:
                 # Skip the newly enrolled device (it already has correct witness)
-                if dev['device_id'] == device_id:
+                if dev.device_id == device_key.raw:
                     continue
                 
-                device_prime = dev['id_prime']
+                device_prime = dev.id_prime
                 if isinstance(device_prime, str):
                     device_prime = int(device_prime)
                 
@@ -878,9 +963,9 @@ async def execute_transaction(execution_data: Dict[str, Any]):
                     lambda_n=settings.lambda_n
                 )
                 fresh_witness_hex = settings.format_accumulator_to_hex(fresh_witness)
-                db.update_device_witness(dev['device_id'], fresh_witness_hex)
-                refreshed_count += 1
+                witness_updates.append((dev.device_id, fresh_witness_hex))
             
+            refreshed_count = await db.bulk_update_witnesses(witness_updates)
             logger.info(f"Refreshed witnesses for {refreshed_count} existing devices")
         
         elif operation_type == "revoke":
@@ -888,18 +973,17 @@ async def execute_transaction(execution_data: Dict[str, Any]):
             await _sync_blockchain_state()
             
             # Update device status in database
-            device_id = bytes.fromhex(tx["device_id"])
-            db.update_device_status(device_id, DeviceStatus.REVOKED)
+            await db.queue_status_update(DeviceKey.from_hex(tx["device_id"]), DeviceStatus.REVOKED)
             logger.info(f"Device {tx['device_id'][:16]}... marked as revoked in database")
             
             # Refresh witnesses for remaining active devices
-            active_devices = db.get_active_devices()
-            new_root_hex = db.get_meta(MetaKeys.ROOT_HEX)
+            active_devices = await db.get_active_devices()
+            new_root_hex = await db.get_meta(MetaKeys.ROOT_HEX)
             new_root = settings.parse_accumulator_from_hex(new_root_hex)
             
-            refreshed_count = 0
+            witness_updates = []
             for dev in active_devices:
-                device_prime = dev['id_prime']
+                device_prime = dev.id_prime
                 if isinstance(device_prime, str):
                     device_prime = int(device_prime)
                 
@@ -911,9 +995,9 @@ async def execute_transaction(execution_data: Dict[str, Any]):
                     lambda_n=settings.lambda_n
                 )
                 fresh_witness_hex = settings.format_accumulator_to_hex(fresh_witness)
-                db.update_device_witness(dev['device_id'], fresh_witness_hex)
-                refreshed_count += 1
+                witness_updates.append((dev.device_id, fresh_witness_hex))
             
+            refreshed_count = await db.bulk_update_witnesses(witness_updates)
             logger.info(f"Refreshed witnesses for {refreshed_count} remaining active devices")
         
         return {"success": True}
@@ -928,10 +1012,12 @@ async def execute_transaction(execution_data: Dict[str, Any]):
 if __name__ == "__main__":
     import uvicorn
     
+    settings = get_settings()
     uvicorn.run(
         "main:app",
         host=settings.host,
         port=settings.port,
+        timeout_keep_alive=settings.keep_alive_timeout,
         reload=True,
         log_level="info"
     )
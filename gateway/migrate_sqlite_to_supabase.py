@@ -103,12 +103,15 @@ def migrate():
         migrated_devices = 0
         failed_devices = 0
         
+        # Look up every device up front instead of one request per device
+        existing = supabase_db.get_devices_by_ids([device['device_id'] for device in devices])
+        
         for idx, device in enumerate(devices, 1):
             device_id_hex = device['device_id'].hex()
             
             try:
                 # Check if device already exists
-                if supabase_db.device_exists(device['device_id']):
+                if device['device_id'] in existing:
                     print(f"   ⚠️  Device {idx}/{len(devices)}: {device_id_hex[:16]}... (already exists, skipping)")
                     continue
                 
@@ -5,84 +5,63 @@ Request/Response models for the FastAPI application.
 Defines the API contract for all endpoints.
 """
 
-from typing import Optional
-from pydantic import BaseModel, Field, validator
+from typing import Annotated, Any, Literal, Optional
+from typing_extensions import TypedDict
+from pydantic import (
+    AfterValidator, AliasChoices, BaseModel, Field, StringConstraints, TypeAdapter, field_validator
+)
+
+
+KeyType = Literal['ed25519', 'rsa']
+
+# Hex string types, validated and lower-cased by pydantic-core
+DeviceIdHex = Annotated[
+    str,
+    StringConstraints(pattern=r'^[0-9a-fA-F]{64}$', to_lower=True, strip_whitespace=True)
+]
+HexStr = Annotated[str, StringConstraints(pattern=r'^[0-9a-fA-F]+$', to_lower=True)]
+
+
+def _check_public_key_pem(v: str) -> str:
+    if not v or not v.strip():
+        raise ValueError('publicKeyPEM cannot be empty')
+    if '-----BEGIN PUBLIC KEY-----' not in v:
+        raise ValueError('publicKeyPEM must be in PEM format')
+    if '-----END PUBLIC KEY-----' not in v:
+        raise ValueError('publicKeyPEM must be in PEM format')
+    return v.strip()
+
+
+# PEM public key, checked by one shared validator
+PublicKeyPEM = Annotated[str, AfterValidator(_check_public_key_pem)]
 
 
 # Request Models
 
 class EnrollRequest(BaseModel):
     """Request model for device enrollment."""
-    publicKeyPEM: str = Field(..., description="Device public key in PEM format")
-    keyType: str = Field(default="ed25519", description="Type of cryptographic key (ed25519 or rsa)")
-    
-    @validator('keyType')
-    def validate_key_type(cls, v):
-        if v not in ['ed25519', 'rsa']:
-            raise ValueError('keyType must be "ed25519" or "rsa"')
-        return v
-    
-    @validator('publicKeyPEM')
-    def validate_public_key_pem(cls, v):
-        if not v or not v.strip():
-            raise ValueError('publicKeyPEM cannot be empty')
-        if '-----BEGIN PUBLIC KEY-----' not in v:
-            raise ValueError('publicKeyPEM must be in PEM format')
-        if '-----END PUBLIC KEY-----' not in v:
-            raise ValueError('publicKeyPEM must be in PEM format')
-        return v.strip()
+    publicKeyPEM: PublicKeyPEM = Field(..., description="Device public key in PEM format")
+    keyType: KeyType = Field(default="ed25519", description="Type of cryptographic key (ed25519 or rsa)")
 
 
 class AuthRequest(BaseModel):
     """Request model for device authentication."""
-    deviceIdHex: str = Field(..., description="Device ID as hex string (64 chars)")
+    deviceIdHex: DeviceIdHex = Field(..., description="Device ID as hex string (64 chars)")
     idPrime: int = Field(..., description="Device's identity prime number", gt=0)
     witnessHex: str = Field(..., description="Membership witness as hex string")
     signatureB64: str = Field(..., description="Base64 encoded signature")
-    nonceHex: str = Field(..., description="Nonce that was signed (hex string)")
-    publicKeyPEM: str = Field(..., description="Device public key in PEM format")
-    keyType: str = Field(default="ed25519", description="Type of cryptographic key")
-    
-    @validator('deviceIdHex')
-    def validate_device_id_hex(cls, v):
-        if not v or len(v) != 64:
-            raise ValueError('deviceIdHex must be 64 hex characters (32 bytes)')
-        try:
-            int(v, 16)
-        except ValueError:
-            raise ValueError('deviceIdHex must be valid hex string')
-        return v.lower()
-    
-    @validator('nonceHex')
-    def validate_nonce_hex(cls, v):
-        if not v:
-            raise ValueError('nonceHex cannot be empty')
-        try:
-            int(v, 16)
-        except ValueError:
-            raise ValueError('nonceHex must be valid hex string')
-        return v.lower()
-    
-    @validator('keyType')
-    def validate_key_type(cls, v):
-        if v not in ['ed25519', 'rsa']:
-            raise ValueError('keyType must be "ed25519" or "rsa"')
-        return v
+    nonceHex: HexStr = Field(..., description="Nonce that was signed (hex string)")
+    publicKeyPEM: Optional[str] = Field(
+        None, description="Ignored; the signature is checked against the enrolled public key"
+    )
+    keyType: KeyType = Field(
+        default="ed25519", description="Ignored; the key type recorded at enrollment is used"
+    )
 
 
 class RevokeRequest(BaseModel):
     """Request model for device revocation."""
-    deviceIdHex: str = Field(..., description="Device ID as hex string (64 chars)")
-    
-    @validator('deviceIdHex')
-    def validate_device_id_hex(cls, v):
-        if not v or len(v) != 64:
-            raise ValueError('deviceIdHex must be 64 hex characters (32 bytes)')
-        try:
-            int(v, 16)
-        except ValueError:
-            raise ValueError('deviceIdHex must be valid hex string')
-        return v.lower()
+    deviceIdHex: DeviceIdHex = Field(..., description="Device ID as hex string (64 chars)")
 
 
 # Response Models
@@ -121,7 +100,7 @@ class ErrorResponse(BaseModel):
     """Standard error response model."""
     error: str = Field(..., description="Error message")
     code: Optional[str] = Field(None, description="Error code")
-    details: Optional[dict] = Field(None, description="Additional error details")
+    details: Optional[dict[str, Any]] = Field(None, description="Additional error details")
 
 
 # Status Models
@@ -154,17 +133,31 @@ class DeviceListResponse(BaseModel):
     revoked: int = Field(..., description="Number of revoked devices")
 
 
+class DeviceInfoRow(TypedDict):
+    """Dict-shaped DeviceInfo for serializing device rows without model instances."""
+    deviceIdHex: str
+    keyType: str
+    idPrime: int
+    status: int
+    createdAt: str
+    updatedAt: str
+
+
+# Serializes device rows straight to JSON bytes for large listings
+DEVICE_LIST_ADAPTER = TypeAdapter(list[DeviceInfoRow])
+
+# Serializes one device row at a time for streamed (NDJSON) listings
+DEVICE_ROW_ADAPTER = TypeAdapter(DeviceInfoRow)
+
+# Validates device ID path parameters with the same rule as request bodies
+DEVICE_ID_ADAPTER = TypeAdapter(DeviceIdHex)
+
+
 # Key generation models
 
 class KeyGenRequest(BaseModel):
     """Request to generate a device keypair for testing."""
-    keyType: str = Field(default="ed25519", description="ed25519 or rsa")
-
-    @validator('keyType')
-    def validate_key_type(cls, v):
-        if v not in ['ed25519', 'rsa']:
-            raise ValueError('keyType must be "ed25519" or "rsa"')
-        return v
+    keyType: KeyType = Field(default="ed25519", description="ed25519 or rsa")
 
 
 class KeyGenResponse(BaseModel):
@@ -178,6 +171,7 @@ class WitnessResponse(BaseModel):
     """Response model for witness query."""
     deviceIdHex: str = Field(..., description="Device ID as hex string")
     witnessHex: str = Field(..., description="Current witness as hex string")
+    idPrime: Optional[int] = Field(None, description="Device's identity prime number")
     status: str = Field(..., description="Device status (active/revoked)")
     lastUpdated: str = Field(..., description="When witness was last updated")
 
@@ -187,112 +181,42 @@ class WitnessResponse(BaseModel):
 class TestEnrollRequest(BaseModel):
     """Simplified model for testing enrollment without real keys."""
     deviceName: str = Field(..., description="Human-readable device name")
-    keyType: str = Field(default="ed25519", description="Type of key to generate")
-    
-    @validator('keyType')
-    def validate_key_type(cls, v):
-        if v not in ['ed25519', 'rsa']:
-            raise ValueError('keyType must be "ed25519" or "rsa"')
-        return v
+    keyType: KeyType = Field(default="ed25519", description="Type of key to generate")
 
 
 class TestAuthRequest(BaseModel):
     """Simplified model for testing authentication."""
-    deviceIdHex: str = Field(..., description="Device ID as hex string")
+    deviceIdHex: DeviceIdHex = Field(..., description="Device ID as hex string")
     message: str = Field(default="test-auth", description="Message to sign for testing")
-    
-    @validator('deviceIdHex')
-    def validate_device_id_hex(cls, v):
-        if not v or len(v) != 64:
-            raise ValueError('deviceIdHex must be 64 hex characters (32 bytes)')
-        return v.lower()
 
 
 # Configuration Models
 
 class AccumulatorParams(BaseModel):
-    """Model for accumulator parameters."""
-    N_hex: str = Field(..., description="RSA modulus N as hex string")
-    g_hex: str = Field(..., description="Generator g as hex string")
-    lambda_n_hex: Optional[str] = Field(None, description="Carmichael lambda as hex string")
+    """Model for accumulator parameters (hex inputs are parsed to int once)."""
+    N: int = Field(..., validation_alias=AliasChoices('N', 'N_hex'), description="RSA modulus N")
+    g: int = Field(..., validation_alias=AliasChoices('g', 'g_hex'), description="Generator g")
+    lambda_n: Optional[int] = Field(
+        None, validation_alias=AliasChoices('lambda_n', 'lambda_n_hex'), description="Carmichael lambda"
+    )
     keySize: int = Field(..., description="RSA key size in bits")
     securityLevel: str = Field(..., description="Security level description")
-
-
-def main():
-    """Test model validation."""
-    print("Testing Pydantic Models")
-    print("=" * 40)
-    
-    # Test EnrollRequest
-    try:
-        enroll_req = EnrollRequest(
-            publicKeyPEM="""-----BEGIN PUBLIC KEY-----
-MCowBQYDK2VwAyEAtest_key_data_here_32_bytes
------END PUBLIC KEY-----""",
-            keyType="ed25519"
-        )
-        print(f"✓ Valid EnrollRequest: {enroll_req.keyType}")
-    except Exception as e:
-        print(f"✗ EnrollRequest validation failed: {e}")
-    
-    # Test invalid keyType
-    try:
-        invalid_req = EnrollRequest(
-            publicKeyPEM="-----BEGIN PUBLIC KEY-----\ntest\n-----END PUBLIC KEY-----",
-            keyType="invalid"
-        )
-        print("✗ Should have failed validation")
-    except Exception as e:
-        print(f"✓ Correctly rejected invalid keyType: {e}")
-    
-    # Test AuthRequest
-    try:
-        auth_req = AuthRequest(
-            deviceIdHex="1234567890abcdef" * 8,  # 64 hex chars
-            idPrime=12345,
-            witnessHex="abcdef123456",
-            signatureB64="dGVzdA==",  # base64 "test"
-            nonceHex="deadbeef",
-            publicKeyPEM="-----BEGIN PUBLIC KEY-----\ntest\n-----END PUBLIC KEY-----",
-            keyType="ed25519"
-        )
-        print(f"✓ Valid AuthRequest: {auth_req.deviceIdHex[:16]}...")
-    except Exception as e:
-        print(f"✗ AuthRequest validation failed: {e}")
     
-    # Test invalid deviceIdHex
-    try:
-        invalid_auth = AuthRequest(
-            deviceIdHex="invalid",  # Wrong length
-            idPrime=12345,
-            witnessHex="abc",
-            signatureB64="dGVzdA==",
-            nonceHex="deadbeef",
-            publicKeyPEM="-----BEGIN PUBLIC KEY-----\ntest\n-----END PUBLIC KEY-----"
-        )
-        print("✗ Should have failed validation")
-    except Exception as e:
-        print(f"✓ Correctly rejected invalid deviceIdHex: {e}")
+    @field_validator('N', 'g', 'lambda_n', mode='before')
+    @classmethod
+    def parse_hex(cls, v):
+        if isinstance(v, str):
+            return int(v, 16)
+        return v
     
-    # Test Response models
-    enroll_resp = EnrollResponse(
-        deviceIdHex="1234567890abcdef" * 8,
-        idPrime=12345,
-        witnessHex="abcdef123456",
-        rootHex="fedcba987654"
-    )
-    print(f"✓ Valid EnrollResponse: {enroll_resp.idPrime}")
+    @property
+    def N_hex(self) -> str:
+        return f'0x{self.N:x}'
     
-    auth_resp = AuthResponse(
-        ok=True,
-        newWitnessHex="updated_witness",
-        message="Authentication successful"
-    )
-    print(f"✓ Valid AuthResponse: {auth_resp.ok}")
+    @property
+    def g_hex(self) -> str:
+        return f'0x{self.g:x}'
     
-    print("Model validation tests complete")
-
-
-if __name__ == "__main__":
-    main()
+    @property
+    def lambda_n_hex(self) -> Optional[str]:
+        return f'0x{self.lambda_n:x}' if self.lambda_n is not None else None
@@ -7,17 +7,95 @@ settings for the FastAPI application.
 
 import os
 import math
+from functools import cached_property, lru_cache
 from typing import Optional
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+try:
+    import gmpy2
+except ImportError:  # Optional: fall back to Python big-int arithmetic
+    gmpy2 = None
+
+
+# AccumulatorRegistry ABI (multi-sig version only), built once at import
+_REGISTRY_ABI: list = [
+    {
+        "inputs": [],
+        "name": "getCurrentState",
+        "outputs": [
+            {"internalType": "bytes", "name": "accumulator", "type": "bytes"},
+            {"internalType": "bytes32", "name": "hash", "type": "bytes32"},
+            {"internalType": "uint256", "name": "ver", "type": "uint256"},
+            {"internalType": "address", "name": "currentSafe", "type": "address"},
+            {"internalType": "uint256", "name": "safeThreshold", "type": "uint256"},
+            {"internalType": "uint256", "name": "safeOwnerCount", "type": "uint256"},
+            {"internalType": "bool", "name": "paused", "type": "bool"}
+        ],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [
+            {"internalType": "bytes", "name": "deviceId", "type": "bytes"},
+            {"internalType": "bytes", "name": "newAccumulator", "type": "bytes"},
+            {"internalType": "bytes32", "name": "parentHash", "type": "bytes32"},
+            {"internalType": "bytes32", "name": "operationId", "type": "bytes32"}
+        ],
+        "name": "registerDevice",
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function"
+    },
+    {
+        "inputs": [
+            {"internalType": "bytes", "name": "deviceId", "type": "bytes"},
+            {"internalType": "bytes", "name": "newAccumulator", "type": "bytes"},
+            {"internalType": "bytes32", "name": "parentHash", "type": "bytes32"},
+            {"internalType": "bytes32", "name": "operationId", "type": "bytes32"}
+        ],
+        "name": "revokeDevice",
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "authorizedSafe",
+        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "version",
+        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "currentAccumulator",
+        "outputs": [{"internalType": "bytes", "name": "", "type": "bytes"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "storedHash",
+        "outputs": [{"internalType": "bytes32", "name": "", "type": "bytes32"}],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]
 
 
 class Settings:
     """Application settings loaded from environment variables."""
     
     def __init__(self):
+        # Load environment variables from .env file
+        load_dotenv()
+        
         # Blockchain settings
         self.rpc_url: str = os.getenv("RPC_URL", "http://127.0.0.1:8545")
         self.private_key_admin: str = os.getenv("PRIVATE_KEY_ADMIN", "")
@@ -47,6 +125,8 @@ class Settings:
         # Database settings - Supabase
         self.supabase_url: str = os.getenv("SUPABASE_URL", "")
         self.supabase_key: str = os.getenv("SUPABASE_KEY", "")
+        # Optional direct Postgres DSN for the asyncpg hot-read path
+        self.supabase_db_url: str = os.getenv("SUPABASE_DB_URL", "")
         
         # Database settings - SQLite (legacy, kept for backwards compatibility)
         self.db_path: str = os.getenv("DB_PATH", "gateway.db")
@@ -54,6 +134,9 @@ class Settings:
         # Server settings
         self.host: str = os.getenv("HOST", "127.0.0.1")
         self.port: int = int(os.getenv("PORT", "8000"))
+        # Idle keep-alive must outlast the device daemon's poll interval
+        # (60s by default) or every poll pays a fresh TCP/TLS handshake
+        self.keep_alive_timeout: int = int(os.getenv("KEEP_ALIVE_TIMEOUT", "75"))
         
         # Validation
         self._validate_settings()
@@ -109,76 +192,23 @@ class Settings:
     
     def get_registry_abi(self) -> list:
         """Get ABI for AccumulatorRegistry contract (multi-sig version)."""
-        # AccumulatorRegistry ABI (multi-sig version only)
-        return [
-            {
-                "inputs": [],
-                "name": "getCurrentState", 
-                "outputs": [
-                    {"internalType": "bytes", "name": "accumulator", "type": "bytes"},
-                    {"internalType": "bytes32", "name": "hash", "type": "bytes32"},
-                    {"internalType": "uint256", "name": "ver", "type": "uint256"},
-                    {"internalType": "address", "name": "currentSafe", "type": "address"},
-                    {"internalType": "uint256", "name": "safeThreshold", "type": "uint256"},
-                    {"internalType": "uint256", "name": "safeOwnerCount", "type": "uint256"},
-                    {"internalType": "bool", "name": "paused", "type": "bool"}
-                ],
-                "stateMutability": "view",
-                "type": "function"
-            },
-            {
-                    "inputs": [
-                        {"internalType": "bytes", "name": "deviceId", "type": "bytes"},
-                        {"internalType": "bytes", "name": "newAccumulator", "type": "bytes"}, 
-                        {"internalType": "bytes32", "name": "parentHash", "type": "bytes32"},
-                        {"internalType": "bytes32", "name": "operationId", "type": "bytes32"}
-                    ],
-                    "name": "registerDevice",
-                    "outputs": [],
-                    "stateMutability": "nonpayable",
-                    "type": "function"
-                },
-                {
-                    "inputs": [
-                        {"internalType": "bytes", "name": "deviceId", "type": "bytes"},
-                        {"internalType": "bytes", "name": "newAccumulator", "type": "bytes"},
-                        {"internalType": "bytes32", "name": "parentHash", "type": "bytes32"},
-                        {"internalType": "bytes32", "name": "operationId", "type": "bytes32"}
-                    ],
-                    "name": "revokeDevice",
-                    "outputs": [],
-                    "stateMutability": "nonpayable", 
-                    "type": "function"
-                },
-                {
-                    "inputs": [],
-                    "name": "authorizedSafe",
-                    "outputs": [{"internalType": "address", "name": "", "type": "address"}],
-                    "stateMutability": "view",
-                    "type": "function"
-                },
-                {
-                    "inputs": [],
-                    "name": "version",
-                    "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-                    "stateMutability": "view",
-                    "type": "function"
-                },
-                {
-                    "inputs": [],
-                    "name": "currentAccumulator",
-                    "outputs": [{"internalType": "bytes", "name": "", "type": "bytes"}],
-                    "stateMutability": "view",
-                    "type": "function"
-                },
-                {
-                    "inputs": [],
-                    "name": "storedHash",
-                    "outputs": [{"internalType": "bytes32", "name": "", "type": "bytes32"}],
-                    "stateMutability": "view",
-                    "type": "function"
-                }
-            ]
+        return _REGISTRY_ABI
+    
+    @cached_property
+    def registry_contract(self):
+        """
+        AccumulatorRegistry contract bound to a Web3 HTTP provider.
+        
+        Built once per Settings instance so the ABI is only decoded once;
+        the underlying Web3 instance is available as ``registry_contract.w3``.
+        """
+        from web3 import Web3
+        
+        w3 = Web3(Web3.HTTPProvider(self.rpc_url))
+        return w3.eth.contract(
+            address=Web3.to_checksum_address(self.registry_address),
+            abi=_REGISTRY_ABI
+        )
     
     def format_accumulator_to_hex(self, accumulator_int: int) -> str:
         """Format accumulator integer to 256-byte hex string."""
@@ -196,11 +226,19 @@ class Settings:
         if len(hex_str) != 512:
             raise ValueError(f"Accumulator hex must be 512 chars (256 bytes), got {len(hex_str)}")
         
-        return int(hex_str, 16)
+        # Fixed-width input: decode bytes directly rather than generic base-16 parsing
+        return int.from_bytes(bytes.fromhex(hex_str), byteorder='big')
 
 
-# Global settings instance
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the shared settings instance, constructing it on first use.
+    
+    Use as a FastAPI dependency (``Depends(get_settings)``); call
+    ``get_settings.cache_clear()`` to force a reload from the environment.
+    """
+    return Settings()
 
 
 def compute_lambda_n_from_factors(p_hex: str, q_hex: str) -> str:
@@ -217,38 +255,21 @@ def compute_lambda_n_from_factors(p_hex: str, q_hex: str) -> str:
     Returns:
         str: λ(N) as hex string
     """
-    p = int(p_hex, 16)
-    q = int(q_hex, 16)
+    if gmpy2 is not None:
+        # GMP's gcd/multiplication are considerably faster on 1024-bit factors
+        p = gmpy2.mpz(p_hex, 16)
+        q = gmpy2.mpz(q_hex, 16)
+        gcd = gmpy2.gcd
+    else:
+        p = int(p_hex, 16)
+        q = int(q_hex, 16)
+        gcd = math.gcd
     
     # λ(N) = lcm(p-1, q-1)
     p_minus_1 = p - 1
     q_minus_1 = q - 1
-    gcd_val = math.gcd(p_minus_1, q_minus_1)
+    gcd_val = gcd(p_minus_1, q_minus_1)
     lambda_n = (p_minus_1 // gcd_val) * q_minus_1
     
-    return hex(lambda_n)
-
-
-def main():
-    """Test settings loading."""
-    print("IoT Identity Gateway Settings")
-    print("=" * 40)
-    print(f"RPC URL: {settings.rpc_url}")
-    print(f"Registry: {settings.registry_address}")
-    print(f"Database: {settings.db_path}")
-    print(f"Host: {settings.host}:{settings.port}")
-    print(f"N (first 20 chars): {settings.n_hex[:22]}...")
-    print(f"g: {settings.g_hex}")
-    print(f"λ(N) (first 20 chars): {settings.lambda_n_hex[:22]}...")
-    
-    # Test accumulator formatting
-    test_acc = settings.g  # Start with generator
-    hex_str = settings.format_accumulator_to_hex(test_acc)
-    print(f"Test accumulator hex (256 bytes): {hex_str[:32]}...{hex_str[-32:]}")
-    
-    parsed = settings.parse_accumulator_from_hex(hex_str)
-    print(f"Round-trip test: {test_acc == parsed}")
-
+    return hex(int(lambda_n))
 
-if __name__ == "__main__":
-    main()
@@ -0,0 +1,6 @@
+"""
+Tests package for the IoT Identity Gateway
+
+Unit tests cover the gateway's pure helpers (row encoding, request
+handling) without a live Supabase project or blockchain node.
+"""
@@ -0,0 +1,9 @@
+"""
+Unit tests for IoT Identity Gateway components
+
+Tests individual modules in isolation:
+- test_device_rows.py: id_prime bytea encoding and device row conversion
+- test_auth_endpoint.py: /auth signature checks against the enrolled key
+- test_device_id.py: Device ID path parameter validation
+- test_status_batcher.py: Status update coalescing and error propagation
+"""
@@ -0,0 +1,98 @@
+"""
+Unit Tests for the /auth Endpoint
+
+Tests that signatures are verified against the enrolled public key and key
+type, not the ones presented in the request, using an in-memory database
+stand-in and toy accumulator parameters.
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import main
+from async_supabase_db import DeviceRecord, DeviceStatus
+from settings import get_settings
+from accum.rsa_key_generator import generate_device_signature, generate_ed25519_keypair
+
+
+# Toy accumulator: N = 11 * 19, witness g, member prime 13, root = g^13 mod N
+N = 209
+WITNESS = 4
+ID_PRIME = 13
+ROOT = pow(WITNESS, ID_PRIME, N)
+DEVICE_ID_HEX = "ab" * 32
+NONCE_HEX = "deadbeef"
+
+
+@pytest.fixture
+def enrolled_keypair(monkeypatch):
+    """Enroll one device (in a mocked database) and return its key pair."""
+    private_b64, public_pem = generate_ed25519_keypair()
+    device = DeviceRecord(
+        bytes.fromhex(DEVICE_ID_HEX), public_pem, ID_PRIME, f"{WITNESS:x}",
+        "ed25519", DeviceStatus.ACTIVE, "", ""
+    )
+    db = SimpleNamespace(
+        get_device=AsyncMock(return_value=device),
+        get_meta=AsyncMock(return_value=f"{ROOT:x}")
+    )
+    monkeypatch.setattr(main, "db", db)
+    
+    settings = SimpleNamespace(N=N, parse_accumulator_from_hex=lambda h: int(h, 16))
+    main.app.dependency_overrides[get_settings] = lambda: settings
+    yield private_b64, public_pem
+    main.app.dependency_overrides.pop(get_settings, None)
+
+
+def post_auth(payload):
+    """POST /auth against the app in-process."""
+    async def call():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as client:
+            return await client.post("/auth", json=payload)
+    return asyncio.run(call())
+
+
+def auth_payload(private_b64, public_pem):
+    return {
+        "deviceIdHex": DEVICE_ID_HEX,
+        "idPrime": ID_PRIME,
+        "witnessHex": f"{WITNESS:x}",
+        "signatureB64": generate_device_signature(NONCE_HEX, private_b64),
+        "nonceHex": NONCE_HEX,
+        "publicKeyPEM": public_pem,
+        "keyType": "ed25519",
+    }
+
+
+class TestAuthSignatureKey:
+    """Test which public key /auth verifies the signature against."""
+    
+    def test_enrolled_key_authenticates(self, enrolled_keypair):
+        """A signature by the enrolled key with a valid witness succeeds."""
+        private_b64, public_pem = enrolled_keypair
+        resp = post_auth(auth_payload(private_b64, public_pem))
+        assert resp.status_code == 200
+        assert resp.json()["ok"] is True
+    
+    def test_other_key_rejected(self, enrolled_keypair):
+        """A valid id and witness signed by a different key gets 401."""
+        other_private_b64, other_public_pem = generate_ed25519_keypair()
+        resp = post_auth(auth_payload(other_private_b64, other_public_pem))
+        assert resp.status_code == 401
+        assert resp.json()["code"] == "AUTH_FAILED"
+    
+    def test_presented_key_type_ignored(self, enrolled_keypair):
+        """Claiming keyType='rsa' does not change how the signature is checked."""
+        private_b64, public_pem = enrolled_keypair
+        payload = auth_payload(private_b64, public_pem)
+        payload["keyType"] = "rsa"
+        assert post_auth(payload).status_code == 200
@@ -0,0 +1,39 @@
+"""
+Unit Tests for Device ID Path Parameters
+
+Tests parse_device_id, which turns /witness/{device_id_hex} style path
+parameters into DeviceKeys.
+"""
+
+import os
+import sys
+
+import pytest
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from main import parse_device_id
+
+
+class TestParseDeviceId:
+    """Test device ID path parameter validation."""
+    
+    def test_valid_id(self):
+        """64 hex characters parse to a 32-byte key with matching hex."""
+        key = parse_device_id("AB" * 32)
+        assert key.raw == bytes.fromhex("ab" * 32)
+        assert key.hex == "ab" * 32
+    
+    @pytest.mark.parametrize("device_id_hex", [
+        "0x" + "ab" * 31,   # 64 characters, but only 62 hex digits
+        "ab" * 31,
+        "ab" * 33,
+        "zz" * 32,
+        "",
+    ])
+    def test_invalid_id_rejected(self, device_id_hex):
+        """Anything but exactly 64 hex characters is a 400."""
+        with pytest.raises(HTTPException) as exc_info:
+            parse_device_id(device_id_hex)
+        assert exc_info.value.status_code == 400
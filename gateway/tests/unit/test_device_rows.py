@@ -0,0 +1,70 @@
+"""
+Unit Tests for Supabase Device Row Encoding
+
+Tests the id_prime bytea round trip used by the async database manager,
+including decimal string input from the legacy SQLite store and rows that
+only carry the legacy decimal id_prime column.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from async_supabase_db import _device_to_row, _prime_from_row, _prime_to_bytea
+
+
+PRIMES = [2, 255, 256, 65537, 2**127 - 1, 2**521 - 1]
+
+
+class TestPrimeBytea:
+    """Test id_prime encoding to and from PostgREST bytea literals."""
+    
+    @pytest.mark.parametrize("prime", PRIMES)
+    def test_int_round_trip(self, prime):
+        """Integer primes survive encoding and decoding."""
+        row = {'id_prime_bytes': _prime_to_bytea(prime), 'id_prime': None}
+        assert _prime_from_row(row) == prime
+    
+    @pytest.mark.parametrize("prime", PRIMES)
+    def test_str_round_trip(self, prime):
+        """Decimal string primes (legacy SQLite TEXT) encode like ints."""
+        assert _prime_to_bytea(str(prime)) == _prime_to_bytea(prime)
+        row = {'id_prime_bytes': _prime_to_bytea(str(prime)), 'id_prime': None}
+        assert _prime_from_row(row) == prime
+    
+    def test_literal_format(self):
+        """Encoding is minimal-length big-endian hex with a \\x prefix."""
+        assert _prime_to_bytea(65537) == '\\x010001'
+        assert _prime_to_bytea(0) == '\\x00'
+    
+    @pytest.mark.parametrize("prime", PRIMES)
+    def test_legacy_decimal_column_fallback(self, prime):
+        """Rows not yet backfilled decode from the decimal id_prime column."""
+        assert _prime_from_row({'id_prime_bytes': None, 'id_prime': str(prime)}) == prime
+        assert _prime_from_row({'id_prime': str(prime)}) == prime
+    
+    def test_bytea_column_preferred(self):
+        """The bytea column wins when both columns are present."""
+        row = {'id_prime_bytes': _prime_to_bytea(65537), 'id_prime': '3'}
+        assert _prime_from_row(row) == 65537
+
+
+class TestDeviceToRow:
+    """Test conversion of device dicts into devices table rows."""
+    
+    def test_legacy_str_prime(self):
+        """A migrated SQLite device with a TEXT id_prime converts cleanly."""
+        row = _device_to_row({
+            'device_id': bytes(32),
+            'pubkey_pem': 'pem',
+            'id_prime': '12345',
+            'witness': 'ab',
+        })
+        assert row['device_id'] == '00' * 32
+        assert row['id_prime_bytes'] == _prime_to_bytea(12345)
+        assert _prime_from_row(row) == 12345
+        assert row['key_type'] == 'ed25519'
+        assert row['status'] == 1
@@ -0,0 +1,103 @@
+"""
+Unit Tests for StatusBatcher
+
+Tests that device status updates are coalesced into bulk_update_statuses
+calls, split at max_items, and that every caller's future resolves (or
+fails) with its batch.
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from async_supabase_db import DeviceStatus, StatusBatcher
+
+
+def make_db(side_effect=None):
+    """Database stand-in exposing only bulk_update_statuses."""
+    return SimpleNamespace(bulk_update_statuses=AsyncMock(side_effect=side_effect))
+
+
+def device_id(i: int) -> bytes:
+    return i.to_bytes(32, 'big')
+
+
+class TestStatusBatcher:
+    """Test StatusBatcher coalescing, splitting and error propagation."""
+    
+    def test_updates_within_window_coalesce(self):
+        """Updates submitted within the window are written in one call."""
+        db = make_db()
+        
+        async def run():
+            batcher = StatusBatcher(db, window=0.01, max_items=100)
+            futures = [batcher.submit(device_id(i), DeviceStatus.REVOKED) for i in range(3)]
+            await asyncio.gather(*futures)
+        
+        asyncio.run(run())
+        db.bulk_update_statuses.assert_awaited_once_with(
+            [(device_id(i), DeviceStatus.REVOKED) for i in range(3)]
+        )
+    
+    def test_max_items_splits_batches(self):
+        """Reaching max_items flushes immediately, in batches of max_items."""
+        db = make_db()
+        
+        async def run():
+            batcher = StatusBatcher(db, window=10, max_items=2)
+            futures = [batcher.submit(device_id(i), DeviceStatus.REVOKED) for i in range(4)]
+            await asyncio.wait_for(asyncio.gather(*futures), timeout=1)
+        
+        asyncio.run(run())
+        sizes = [len(call.args[0]) for call in db.bulk_update_statuses.await_args_list]
+        assert sizes == [2, 2]
+    
+    def test_error_reaches_every_future(self):
+        """A failed bulk write fails every future in the batch."""
+        db = make_db(side_effect=RuntimeError("write failed"))
+        
+        async def run():
+            batcher = StatusBatcher(db, window=0.01, max_items=100)
+            futures = [batcher.submit(device_id(i), DeviceStatus.REVOKED) for i in range(3)]
+            return await asyncio.gather(*futures, return_exceptions=True)
+        
+        results = asyncio.run(run())
+        assert len(results) == 3
+        assert all(isinstance(r, RuntimeError) for r in results)
+    
+    def test_aclose_writes_pending(self):
+        """aclose flushes queued updates without waiting for the window."""
+        db = make_db()
+        
+        async def run():
+            batcher = StatusBatcher(db, window=10, max_items=100)
+            future = batcher.submit(device_id(1), DeviceStatus.REVOKED)
+            await asyncio.wait_for(batcher.aclose(), timeout=1)
+            return future
+        
+        future = asyncio.run(run())
+        assert future.done() and future.exception() is None
+        db.bulk_update_statuses.assert_awaited_once()
+    
+    def test_flush_tasks_are_referenced(self):
+        """In-flight flush tasks are held by the batcher until they finish."""
+        async def run():
+            gate = asyncio.Event()
+            
+            async def slow_write(updates):
+                await gate.wait()
+            
+            batcher = StatusBatcher(SimpleNamespace(bulk_update_statuses=slow_write), window=10, max_items=1)
+            future = batcher.submit(device_id(1), DeviceStatus.REVOKED)
+            await asyncio.sleep(0)
+            assert len(batcher._tasks) == 1
+            gate.set()
+            await future
+            await asyncio.sleep(0)
+            assert not batcher._tasks
+        
+        asyncio.run(run())
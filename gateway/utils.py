@@ -0,0 +1,17 @@
+"""
+Small shared helpers for the IoT Identity Gateway.
+"""
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1024)
+def hex_to_bytes(hex_str: str) -> bytes:
+    """
+    Decode a hex string (optionally 0x-prefixed) to bytes.
+    
+    Cached because the same device IDs are decoded over and over (every
+    row read and every request for a device); only use it for short,
+    frequently repeated values, not large one-off blobs.
+    """
+    return bytes.fromhex(hex_str.removeprefix('0x'))
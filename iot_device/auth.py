@@ -10,17 +10,24 @@ Defaults:
 import sys
 import base64
 import secrets
-import requests
+from functools import lru_cache
+
 from cryptography.hazmat.primitives.asymmetric import ed25519
 from cryptography.hazmat.primitives import serialization
 
-from state import get, update_state
+from http_client import SESSION
+from state import load_state, update_state
 
 
-def sign(private_key_b64: str, message: str) -> str:
+@lru_cache(maxsize=4)
+def _load_private_key(private_key_b64: str) -> ed25519.Ed25519PrivateKey:
+    # Key objects are immutable; decode each stored key only once
     private_bytes = base64.b64decode(private_key_b64)
-    private_key = ed25519.Ed25519PrivateKey.from_private_bytes(private_bytes)
-    sig = private_key.sign(message.encode())
+    return ed25519.Ed25519PrivateKey.from_private_bytes(private_bytes)
+
+
+def sign(private_key_b64: str, message: str) -> str:
+    sig = _load_private_key(private_key_b64).sign(message.encode())
     return base64.b64encode(sig).decode()
 
 
@@ -39,35 +46,36 @@ def authenticate_device(base_url: str) -> dict:
     """
     base_url = base_url.rstrip('/')
     
+    # Read the state file once and work from the snapshot
+    state = load_state()
+
     # Check if enrollment is pending
-    pending = get("pending_enrollment")
-    if pending:
+    if state.get("pending_enrollment"):
         return {
             "success": False,
             "message": "Enrollment pending multi-sig approval",
-            "safeTxHash": get('safe_tx_hash'),
-            "deviceIdHex": get('device_id_hex')
+            "safeTxHash": state.get('safe_tx_hash'),
+            "deviceIdHex": state.get('device_id_hex')
         }
 
     required = ["device_id_hex", "id_prime", "witness_hex", "public_key_pem", "private_key"]
-    missing = [k for k in required if get(k) is None]
+    missing = [k for k in required if state.get(k) is None]
     if missing:
         raise Exception(f"Missing required state fields: {', '.join(missing)}")
 
     nonce_hex = secrets.token_hex(16)
-    signature_b64 = sign(get("private_key"), nonce_hex)
+    signature_b64 = sign(state["private_key"], nonce_hex)
 
     payload = {
-        "deviceIdHex": get("device_id_hex"),
-        "idPrime": get("id_prime"),
-        "witnessHex": get("witness_hex"),
+        "deviceIdHex": state["device_id_hex"],
+        "idPrime": state["id_prime"],
+        "witnessHex": state["witness_hex"],
         "signatureB64": signature_b64,
         "nonceHex": nonce_hex,
-        "publicKeyPEM": get("public_key_pem"),
         "keyType": "ed25519"
     }
 
-    resp = requests.post(f"{base_url}/auth", json=payload, timeout=15)
+    resp = SESSION.post(f"{base_url}/auth", json=payload, timeout=15)
 
     if resp.status_code != 200:
         try:
@@ -11,8 +11,8 @@ Defaults:
 """
 
 import sys
-import requests
-from state import get, update_state
+from http_client import SESSION
+from state import get, load_state, update_state
 
 
 def check_and_update_enrollment(base_url: str) -> dict:
@@ -30,32 +30,38 @@ def check_and_update_enrollment(base_url: str) -> dict:
     """
     base_url = base_url.rstrip('/')
     
+    # Read the state file once and work from the snapshot
+    state = load_state()
+    
     # Check if there's a pending enrollment
-    pending = get("pending_enrollment")
-    device_id_hex = get("device_id_hex")
+    pending = state.get("pending_enrollment")
+    device_id_hex = state.get("device_id_hex")
     
     if not pending:
         return {
             "enrolled": True,
             "message": "No pending enrollment",
-            "status": get("status")
+            "status": state.get("status")
         }
     
     if not device_id_hex:
         raise Exception("No device ID found in state")
 
-    # First, try to get all devices to find our id_prime if missing
-    id_prime = get("id_prime")
+    # id_prime may be missing after a multi-sig enrollment
+    id_prime = state.get("id_prime")
     
     # Try to get device witness (this will work only if device is enrolled)
-    resp = requests.get(f"{base_url}/witness/{device_id_hex}", timeout=10)
+    resp = SESSION.get(f"{base_url}/witness/{device_id_hex}", timeout=10)
     
     if resp.status_code == 200:
         data = resp.json()
         
-        # Get id_prime from devices endpoint if we don't have it
+        # The witness response carries id_prime; only gateways that predate
+        # that need the full /devices listing
+        if not id_prime:
+            id_prime = data.get("idPrime")
         if not id_prime:
-            devices_resp = requests.get(f"{base_url}/devices", timeout=10)
+            devices_resp = SESSION.get(f"{base_url}/devices", timeout=10)
             if devices_resp.status_code == 200:
                 devices_data = devices_resp.json()
                 for device in devices_data.get('devices', []):
@@ -112,7 +118,7 @@ def main():
             print("\n✅ Local state updated - device ready to authenticate!")
             
             # Try to get the full system status
-            status_resp = requests.get(f"{base_url}/status", timeout=10)
+            status_resp = SESSION.get(f"{base_url}/status", timeout=10)
             if status_resp.status_code == 200:
                 status_data = status_resp.json()
                 print(f"   • Total Devices: {status_data.get('totalDevices')}")
@@ -13,12 +13,14 @@ Examples:
 """
 
 import argparse
+import random
 import time
 import sys
 import logging
 from pathlib import Path
 
 from auth import authenticate_device
+from http_client import SESSION
 from state import load_state, save_state
 from check_enrollment import check_and_update_enrollment
 
@@ -80,6 +82,13 @@ class DeviceDaemon:
                     return True
             except Exception as e:
                 logger.error(f"Failed to check enrollment status: {e}")
+                # Enrollment may have been completed meanwhile (e.g. by
+                # check_enrollment.py); trust the persisted state if so
+                state = load_state()
+                if (not state.get('pending_enrollment')
+                        and state.get('id_prime') and state.get('witness_hex')):
+                    logger.warning("Gateway unreachable; using cached enrollment state")
+                    return True
                 return False
         
         # Check if device has required auth credentials
@@ -89,6 +98,13 @@ class DeviceDaemon:
         
         return True
     
+    def _prewarm(self) -> None:
+        """Open the shared connection before the first auth so it doesn't pay the handshake."""
+        try:
+            SESSION.get(f"{self.gateway_url}/", timeout=5)
+        except Exception as e:
+            logger.debug(f"Connection prewarm failed: {e}")
+    
     def authenticate_once(self) -> bool:
         """
         Perform single authentication attempt.
@@ -137,6 +153,8 @@ class DeviceDaemon:
             logger.error("Device not ready. Exiting.")
             return 1
         
+        self._prewarm()
+        
         self.running = True
         logger.info("Starting authentication loop... (Press Ctrl+C to stop)")
         
@@ -155,9 +173,11 @@ class DeviceDaemon:
                 if success:
                     logger.info(f"Waiting {self.auth_interval}s until next auth...")
                 else:
-                    # Exponential backoff on failure
-                    backoff = min(self.auth_interval * (2 ** (self.consecutive_failures - 1)), 300)
-                    logger.info(f"Retrying in {backoff}s...")
+                    # Exponential backoff on failure, with full jitter so a fleet
+                    # restarting together doesn't retry in lockstep
+                    cap = min(self.auth_interval * (2 ** (self.consecutive_failures - 1)), 300)
+                    backoff = random.uniform(0, cap)
+                    logger.info(f"Retrying in {backoff:.1f}s...")
                     time.sleep(backoff)
                     continue
                 
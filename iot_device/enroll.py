@@ -8,7 +8,7 @@ Defaults:
 """
 
 import sys
-import requests
+from http_client import SESSION
 from state import get, update_state
 
 
@@ -25,7 +25,7 @@ def main():
         "keyType": "ed25519"
     }
 
-    resp = requests.post(f"{base_url}/enroll", json=payload, timeout=30)
+    resp = SESSION.post(f"{base_url}/enroll", json=payload, timeout=30)
 
     # Handle multi-sig mode (202 Accepted)
     if resp.status_code == 202:
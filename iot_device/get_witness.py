@@ -8,7 +8,7 @@ Defaults:
 """
 
 import sys
-import requests
+from http_client import SESSION
 from state import get, update_state
 
 
@@ -20,7 +20,7 @@ def main():
         print("❌ No device_id_hex found. Enroll first: python enroll.py")
         sys.exit(1)
 
-    resp = requests.get(f"{base_url}/witness/{device_id_hex}", timeout=10)
+    resp = SESSION.get(f"{base_url}/witness/{device_id_hex}", timeout=10)
 
     if resp.status_code != 200:
         try:
@@ -0,0 +1,16 @@
+"""
+Shared HTTP session for IoT device scripts.
+
+All gateway calls go through one keep-alive requests.Session so repeated
+requests (daemon polls, enrollment checks) reuse the TCP/TLS connection
+instead of reconnecting every time.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
@@ -2,17 +2,31 @@
 Generate an Ed25519 keypair and store in device_state/state.json
 
 Usage:
-  python keygen.py
+  python keygen.py [--force]
 """
 
+import argparse
 import base64
+import sys
 from cryptography.hazmat.primitives.asymmetric import ed25519
 from cryptography.hazmat.primitives import serialization
 
-from state import update_state, load_state, STATE_FILE
+from state import save_state, load_state, STATE_FILE
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate a device Ed25519 keypair")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Replace the keys of an already enrolled device (discards its enrollment)"
+    )
+    args = parser.parse_args()
+
+    if load_state().get("device_id_hex") and not args.force:
+        print("❌ Device is already enrolled; new keys would invalidate it. Use --force to replace them.")
+        sys.exit(1)
+
     # Generate Ed25519 keypair
     private_key = ed25519.Ed25519PrivateKey.generate()
     public_key = private_key.public_key()
@@ -31,11 +45,12 @@ def main():
         format=serialization.PublicFormat.SubjectPublicKeyInfo
     ).decode()
 
-    update_state({
+    # A new keypair is a new identity, so start from a fresh state file
+    save_state({
         "private_key": private_b64,
         "public_key_pem": public_pem,
         "key_type": "ed25519"
-    })
+    }, pretty=True)
 
     print("✅ Keypair generated and saved")
     print(f"📄 State file: {STATE_FILE}")
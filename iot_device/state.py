@@ -12,7 +12,7 @@ Stores and retrieves:
 import json
 import os
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 
 custom_dir = os.getenv("DEVICE_STATE_DIR")
@@ -21,22 +21,56 @@ STATE_DIR.mkdir(exist_ok=True)
 STATE_FILE = STATE_DIR / "state.json"
 
 
-def load_state() -> Dict[str, Any]:
-    if not STATE_FILE.exists():
-        return {}
-    with open(STATE_FILE, "r") as f:
-        return json.load(f)
+# Last parsed state and the (mtime, size) of the file it came from; reads
+# are served from memory until state.json changes on disk
+_cache: Optional[Dict[str, Any]] = None
+_cache_sig: Optional[Tuple[int, int]] = None
 
 
-def save_state(data: Dict[str, Any]) -> None:
-    with open(STATE_FILE, "w") as f:
-        json.dump(data, f, indent=2)
+def _file_sig() -> Tuple[int, int]:
+    st = STATE_FILE.stat()
+    return st.st_mtime_ns, st.st_size
 
 
-def update_state(partial: Dict[str, Any]) -> Dict[str, Any]:
+def load_state() -> Dict[str, Any]:
+    global _cache, _cache_sig
+    try:
+        sig = _file_sig()
+    except FileNotFoundError:
+        return {}
+    if _cache is None or sig != _cache_sig:
+        with open(STATE_FILE, "r") as f:
+            _cache = json.load(f)
+        _cache_sig = sig
+    # Callers mutate the result, so hand out a copy
+    return dict(_cache)
+
+
+def save_state(data: Dict[str, Any], pretty: bool = False) -> None:
+    global _cache, _cache_sig
+    # Write a temp file and rename it over state.json so a crash or a
+    # concurrent reader never sees a half-written file
+    tmp = STATE_FILE.with_suffix(".json.tmp")
+    try:
+        with open(tmp, "w") as f:
+            if pretty:
+                json.dump(data, f, indent=2)
+            else:
+                json.dump(data, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, STATE_FILE)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    _cache = dict(data)
+    _cache_sig = _file_sig()
+
+
+def update_state(partial: Dict[str, Any], pretty: bool = False) -> Dict[str, Any]:
     data = load_state()
     data.update(partial)
-    save_state(data)
+    save_state(data, pretty=pretty)
     return data
 
 
@@ -0,0 +1,5 @@
+"""
+Tests package for the IoT device scripts
+
+Unit tests cover the local device state handling without a gateway.
+"""
@@ -0,0 +1,6 @@
+"""
+Unit tests for IoT device script components
+
+Tests individual modules in isolation:
+- test_state.py: Cached state reads and atomic state writes
+"""
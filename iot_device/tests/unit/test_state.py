@@ -0,0 +1,113 @@
+"""
+Unit Tests for Device State Storage
+
+Tests load_state's (mtime, size) read cache and save_state's atomic
+temp-file-and-rename write.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import state
+
+
+@pytest.fixture(autouse=True)
+def state_file(tmp_path, monkeypatch):
+    """Point the state module at an empty temp directory with a cold cache."""
+    path = tmp_path / "state.json"
+    monkeypatch.setattr(state, "STATE_FILE", path)
+    monkeypatch.setattr(state, "_cache", None)
+    monkeypatch.setattr(state, "_cache_sig", None)
+    return path
+
+
+def count_json_loads(monkeypatch):
+    """Count json.load calls made by the state module."""
+    calls = []
+    real_load = json.load
+    
+    def counting_load(f):
+        calls.append(f)
+        return real_load(f)
+    
+    monkeypatch.setattr(state.json, "load", counting_load)
+    return calls
+
+
+class TestLoadStateCache:
+    """Test that reads are cached until state.json changes on disk."""
+    
+    def test_missing_file_is_empty(self):
+        assert state.load_state() == {}
+    
+    def test_cache_hit(self, state_file, monkeypatch):
+        """An unchanged file is parsed once."""
+        state_file.write_text('{"id_prime": 13}')
+        calls = count_json_loads(monkeypatch)
+        
+        assert state.load_state() == {"id_prime": 13}
+        assert state.load_state() == {"id_prime": 13}
+        assert len(calls) == 1
+    
+    def test_returned_dict_is_a_copy(self, state_file):
+        """Mutating a loaded state does not leak into later reads."""
+        state_file.write_text('{"id_prime": 13}')
+        state.load_state()["id_prime"] = 17
+        assert state.load_state() == {"id_prime": 13}
+    
+    def test_external_rewrite_invalidates(self, state_file, monkeypatch):
+        """Another process rewriting state.json is picked up on the next read."""
+        state_file.write_text('{"witness_hex": "aa"}')
+        calls = count_json_loads(monkeypatch)
+        assert state.load_state() == {"witness_hex": "aa"}
+        
+        # Same size, different content; bump mtime so the signature changes
+        state_file.write_text('{"witness_hex": "bb"}')
+        st = state_file.stat()
+        os.utime(state_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        
+        assert state.load_state() == {"witness_hex": "bb"}
+        assert len(calls) == 2
+    
+    def test_save_refreshes_cache(self, monkeypatch):
+        """A state saved by this process is served without re-parsing."""
+        state.save_state({"status": "active"})
+        calls = count_json_loads(monkeypatch)
+        assert state.load_state() == {"status": "active"}
+        assert calls == []
+
+
+class TestSaveState:
+    """Test atomic writes and output formatting."""
+    
+    def test_compact_by_default(self, state_file):
+        state.save_state({"a": 1, "b": [1, 2]})
+        assert state_file.read_text() == '{"a":1,"b":[1,2]}'
+    
+    def test_pretty_output(self, state_file):
+        """pretty=True writes indented JSON that round-trips."""
+        data = {"a": 1, "b": [1, 2]}
+        state.save_state(data, pretty=True)
+        assert state_file.read_text() == json.dumps(data, indent=2)
+        assert state.load_state() == data
+    
+    def test_failed_write_leaves_no_tmp_file(self, state_file):
+        """A write that fails mid-way keeps the old state and no temp file."""
+        state.save_state({"status": "active"})
+        
+        with pytest.raises(TypeError):
+            state.save_state({"status": object()})
+        
+        assert not state_file.with_suffix(".json.tmp").exists()
+        assert json.loads(state_file.read_text()) == {"status": "active"}
+        assert state.load_state() == {"status": "active"}
+    
+    def test_update_state_merges(self):
+        state.save_state({"status": "pending", "id_prime": 13})
+        assert state.update_state({"status": "active"}) == {"status": "active", "id_prime": 13}
+        assert state.load_state() == {"status": "active", "id_prime": 13}